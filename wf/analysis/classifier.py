@@ -12,13 +12,24 @@ Refering to spec.md, this implements:
 
 from __future__ import annotations
 import math
-from collections import defaultdict, deque
+from collections import deque
 from typing import Any, NamedTuple, List, Tuple
+
+import numpy as np
+from numba import njit
+
 from wf.storage.dao import DAO
-from wf.analysis.types import Obs, Win, MobileTrackPoint
+from wf.analysis.types import ObsTable, Win, MobileTrackPoint
 from wf.analysis.config import ClassifierConfig
 from wf.utils.log import get_logger
-from wf.utils.geo import haversine, geometric_median
+from wf.utils.geo import (
+    haversine,
+    haversine_rad,
+    geometric_median,
+    diameter_bounds,
+    max_pairwise_distance,
+)
+from wf.utils.mac import mac_to_int
 
 logger = get_logger(__name__)
 
@@ -32,6 +43,85 @@ MOBILE_DECIM_T = 30     # seconds threshold for decimation
 MAX_SPEED_MS   = 200e3 / 3600  # 200 km/h in m/s
 # -----------------------------------------------------------------------------
 
+def _segment_sum(values: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """
+    Sum `values` over each half-open [start, stop) index range.
+
+    Parameters
+    ----------
+    values
+        1-D array to reduce.
+    starts
+        Start index of each (non-empty) range.
+    stops
+        Stop index of each range.
+
+    Returns
+    -------
+    np.ndarray
+        One sum per range.
+    """
+    # reduceat over interleaved bounds leaves the range sums at even positions;
+    # the trailing zero keeps stop == len(values) a valid index
+    bounds = np.column_stack((starts, stops)).ravel()
+    return np.add.reduceat(np.append(values, 0), bounds)[::2]
+
+@njit(cache=True)
+def _decimate_tracks(
+    ts: np.ndarray,
+    lat: np.ndarray,
+    lon: np.ndarray,
+    track_starts: np.ndarray,
+    decim_d: float,
+    decim_t: int,
+    max_speed: float,
+) -> np.ndarray:
+    """
+    Apply spatial and temporal decimation to concatenated tracks.
+
+    Within each track the first point is kept; a later point is kept when it is
+    at least `decim_d` metres or `decim_t` seconds from the last kept point and
+    the implied speed does not exceed `max_speed`.
+
+    Parameters
+    ----------
+    ts, lat, lon
+        Track points, each track sorted by timestamp and stored contiguously.
+    track_starts
+        Index of the first point of each track.
+    decim_d
+        Distance threshold in metres.
+    decim_t
+        Time threshold in seconds.
+    max_speed
+        Speed cap in m/s.
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask of the points that survive decimation.
+    """
+    n = ts.shape[0]
+    keep = np.zeros(n, dtype=np.bool_)
+    n_tracks = track_starts.shape[0]
+    for k in range(n_tracks):
+        start = track_starts[k]
+        stop = track_starts[k + 1] if k + 1 < n_tracks else n
+        keep[start] = True
+        last = start
+        for i in range(start + 1, stop):
+            dt = ts[i] - ts[last]
+            d = haversine_rad(
+                math.radians(lat[last]), math.radians(lon[last]),
+                math.radians(lat[i]), math.radians(lon[i]),
+            )
+            # only keep if far enough or long enough since last
+            if d >= decim_d or dt >= decim_t:
+                if d / max(dt, 1) <= max_speed:
+                    keep[i] = True
+                    last = i
+    return keep
+
 class ClassifierPipeline:
     """
     Stateful pipeline for classifying observations into static APs & mobile tracks.
@@ -46,74 +136,122 @@ class ClassifierPipeline:
         logger.info(f"Loaded {len(obs)} observations")
         wins = self._windowize(obs)
         logger.info(f"Windowized {len(wins)} windows")
-        stat_wins, mob_wins = self._split_stationary(wins)
+        stat_wins, mob_wins = self._split_stationary(obs, wins)
         logger.info(f"Split {len(stat_wins)} stationary and {len(mob_wins)} mobile windows")
-        static_rows = self._aggregate_static(stat_wins)
+        static_rows = self._aggregate_static(obs, stat_wins)
         logger.info(f"Aggregated {len(static_rows)} static APs")
-        mobile_rows = self._decimate_mobile(mob_wins)
+        mobile_rows = self._decimate_mobile(obs, mob_wins)
         logger.info(f"Decimated {len(mobile_rows)} mobile tracks")
         self._write_results(static_rows, mobile_rows)
         logger.info("Classification complete")
 
-    def _load_and_normalize(self) -> list[Obs]:
+    def _load_and_normalize(self) -> ObsTable:
         """
-        Load deduped observations from database and normalize them.
+        Load deduped observations from database into a columnar table
+        sorted by (mac, ts).
         """
-        raw = self.dao.conn.execute(
-            "SELECT DISTINCT mac, ts, lat, lon, rssi FROM observations "
-            "WHERE lat IS NOT NULL AND lon IS NOT NULL"
-        ).fetchall()
+        # size the columns from the raw row count, then fill them batch by batch
+        n_max = self.dao.count_located_observations()
+        mac  = np.empty(n_max, dtype=np.uint64)
+        ts   = np.empty(n_max, dtype=np.int64)
+        lat  = np.empty(n_max, dtype=np.float64)
+        lon  = np.empty(n_max, dtype=np.float64)
+        rssi = np.empty(n_max, dtype=np.float32)
 
-        return [Obs(row["mac"], row["ts"], row["lat"], row["lon"], row["rssi"]) for row in raw]
-    
-    def _windowize(self, obs: list[Obs]) -> list[Win]:
+        # parse each distinct MAC once; unparseable ones get codes above 48 bits
+        codes: dict[str, int] = {}
+        mac_names: dict[int, str] = {}
+        def _encode(mac: str) -> int:
+            code = codes.get(mac)
+            if code is None:
+                try:
+                    code = mac_to_int(mac)
+                except ValueError:
+                    code = (1 << 48) + len(codes)
+                codes[mac] = code
+                mac_names[code] = mac
+            return code
+
+        n = 0
+        for batch in self.dao.iter_located_observations():
+            k = len(batch)
+            b_mac, b_ts, b_lat, b_lon, b_rssi = zip(*batch)
+            mac[n:n+k]  = [_encode(m) for m in b_mac]
+            ts[n:n+k]   = b_ts
+            lat[n:n+k]  = b_lat
+            lon[n:n+k]  = b_lon
+            rssi[n:n+k] = b_rssi
+            n += k
+        # DISTINCT can only shrink the row count
+        mac, ts, lat, lon = mac[:n], ts[:n], lat[:n], lon[:n]
+        # linear RSSI power depends only on the row, so compute it once here
+        power = np.power(10.0, rssi[:n] / 10.0, dtype=np.float32)
+
+        # sqlite already returns rows by (mac, ts); same-case hex text sorts like
+        # the integer codes, so only mixed-case or odd macs need the stable re-sort
+        same_mac = mac[1:] == mac[:-1]
+        in_order = (mac[1:] > mac[:-1]) | (same_mac & (ts[1:] >= ts[:-1]))
+        if in_order.all():
+            return ObsTable(mac, ts, lat, lon, power, mac_names)
+        order = np.lexsort((ts, mac))
+        return ObsTable(mac[order], ts[order], lat[order], lon[order], power[order], mac_names)
+
+    def _windowize(self, obs: ObsTable) -> list[Win]:
         """
         Create visibility windows from observations.
         """
-        wins: list[Win] = []
-        
-        # group by mac
-        obs_by_mac: dict[str, list[Obs]] = defaultdict(list)
-        for o in obs:
-            obs_by_mac[o.mac].append(o)
-        
-        # windowize
-        for mac, points in obs_by_mac.items():
-            pts = sorted(points, key=lambda o: o.ts)
-            cur_pts = [pts[0]]
-            for prev, curr in zip(pts, pts[1:]):
-                if curr.ts - prev.ts >= self.cfg.t_max_gap:
-                    if len(cur_pts) >= self.cfg.min_window_len:
-                        wins.append(Win(mac, cur_pts[0].ts, cur_pts[-1].ts, list(cur_pts)))
-                    cur_pts = []
-                cur_pts.append(curr)
-            if len(cur_pts) >= self.cfg.min_window_len:
-                wins.append(Win(mac, cur_pts[0].ts, cur_pts[-1].ts, list(cur_pts)))
-        return wins
+        n = len(obs)
+        if n == 0:
+            return []
+
+        # a window starts at every mac change or silence of at least t_max_gap
+        breaks = np.empty(n, dtype=bool)
+        breaks[0] = True
+        breaks[1:] = (obs.mac[1:] != obs.mac[:-1]) | (np.diff(obs.ts) >= self.cfg.t_max_gap)
+        starts = np.flatnonzero(breaks)
+        stops = np.append(starts[1:], n)
+
+        keep = (stops - starts) >= self.cfg.min_window_len
+        starts, stops = starts[keep], stops[keep]
+
+        names = obs.mac_names
+        return [
+            Win(names[mac], ts_start, ts_end, start, stop)
+            for mac, ts_start, ts_end, start, stop in zip(
+                obs.mac[starts].tolist(),
+                obs.ts[starts].tolist(),
+                obs.ts[stops - 1].tolist(),
+                starts.tolist(),
+                stops.tolist(),
+            )
+        ]
     
-    def _split_stationary(self, wins: list[Win]) -> tuple[list[Win], list[Win]]:
+    def _split_stationary(self, obs: ObsTable, wins: list[Win]) -> tuple[list[Win], list[Win]]:
         """
         Split windows into stationary & mobile.
         """
+        r_stationary = self.cfg.r_stationary
         stat_wins: list[Win] = []
         mob_wins: list[Win] = []
         for w in wins:
-            # compute d_max
-            maxd = 0.0
-            pts = w.points
-            for i in range(len(pts)):
-                for j in range(i+1, len(pts)):
-                    d = haversine((pts[i].lat, pts[i].lon), (pts[j].lat, pts[j].lon))
-                    if d > maxd:
-                        maxd = d
-            if maxd <= self.cfg.r_stationary:
+            lat = obs.lat[w.start:w.stop]
+            lon = obs.lon[w.start:w.stop]
+            # bounding-box bounds settle most windows without the pairwise pass
+            lower, upper = diameter_bounds(lat, lon)
+            if upper <= r_stationary:
+                stationary = True
+            elif lower > r_stationary:
+                stationary = False
+            else:
+                stationary = max_pairwise_distance(lat, lon) <= r_stationary
+            if stationary:
                 stat_wins.append(w)
             else:
                 mob_wins.append(w)
         return stat_wins, mob_wins
 
     
-    def _aggregate_static(self, stat_wins: list[Win]) -> list[tuple]:
+    def _aggregate_static(self, obs: ObsTable, stat_wins: list[Win]) -> list[tuple]:
         """
         Aggregate static APs via RSSI-weighted geometric median.
         
@@ -122,48 +260,76 @@ class ClassifierPipeline:
         single weighted centroid (and total‐weight + counts) and then running your geometric‐median
         & error loops over those window‐summaries instead of all of the raw Obs.
         """
+        n_wins = len(stat_wins)
+        if n_wins == 0:
+            return []
+
         # 1) collapse each window to one centroid + total weight + time span + obs count
-        win_centers_by_mac: dict[str, list[tuple[float, float]]] = defaultdict(list)
-        win_weights_by_mac: dict[str, list[float]]           = defaultdict(list)
-        ts0_by_mac:         dict[str, list[int]]             = defaultdict(list)
-        ts1_by_mac:         dict[str, list[int]]             = defaultdict(list)
-        n_obs_by_mac:       dict[str, int]                   = defaultdict(int)
-
-        for w in stat_wins:
-            # per-window weights & weighted centroid
-            wts = [10 ** (p.rssi / 10) for p in w.points]
-            tot_w = sum(wts)
-            lat_c = sum(w * p.lat for w, p in zip(wts, w.points)) / tot_w
-            lon_c = sum(w * p.lon for w, p in zip(wts, w.points)) / tot_w
-
-            win_centers_by_mac[w.mac].append((lat_c, lon_c))
-            win_weights_by_mac[w.mac].append(tot_w)
-            ts0_by_mac[w.mac].append(w.ts_start)
-            ts1_by_mac[w.mac].append(w.ts_end)
-            n_obs_by_mac[w.mac] += len(w.points)
-
-        # 2) for each MAC, run geometric median only on window-centroids
+        starts = np.fromiter((w.start for w in stat_wins), dtype=np.int64, count=n_wins)
+        stops  = np.fromiter((w.stop for w in stat_wins), dtype=np.int64, count=n_wins)
+
+        # accumulate the float32 power column in float64
+        w_all   = obs.power.astype(np.float64)
+        weights = _segment_sum(w_all, starts, stops)
+        centers = np.column_stack((
+            _segment_sum(w_all * obs.lat, starts, stops) / weights,
+            _segment_sum(w_all * obs.lon, starts, stops) / weights,
+        ))
+        ts0     = obs.ts[starts]
+        ts1     = obs.ts[stops - 1]
+        counts  = stops - starts
+        win_mac = obs.mac[starts]
+
+        # 2) windows of one MAC are contiguous, so per-MAC aggregates are segment reductions
+        mac_starts = np.flatnonzero(np.r_[True, win_mac[1:] != win_mac[:-1]])
+        mac_stops = np.append(mac_starts[1:], n_wins)
+        first_seen = np.minimum.reduceat(ts0, mac_starts).tolist()
+        last_seen = np.maximum.reduceat(ts1, mac_starts).tolist()
+        n_obs = np.add.reduceat(counts, mac_starts).tolist()
+        total_w = np.add.reduceat(weights, mac_starts)
+
+        # 3) for each MAC, run geometric median only on window-centroids
         static_rows: list[tuple] = []
-        for mac, centers in win_centers_by_mac.items():
-            wts      = win_weights_by_mac[mac]
-            lat_med, lon_med = geometric_median(centers, wts)
+        for k, (a, b) in enumerate(zip(mac_starts.tolist(), mac_stops.tolist())):
+            mac_centers = centers[a:b].tolist()
+            wts = weights[a:b].tolist()
+
+            # one or two centroids have a closed-form median; skip the solver
+            if b - a == 1:
+                (lat_med, lon_med), = mac_centers
+                static_rows.append((
+                    stat_wins[a].mac, lat_med, lon_med, 0.0,
+                    first_seen[k], last_seen[k], n_obs[k],
+                ))
+                continue
+            if b - a == 2:
+                # the weighted median of two points is the heavier one; on a tie
+                # every point between them is optimal, so take the midpoint
+                (lat0, lon0), (lat1, lon1) = mac_centers
+                if wts[0] > wts[1]:
+                    lat_med, lon_med = lat0, lon0
+                elif wts[1] > wts[0]:
+                    lat_med, lon_med = lat1, lon1
+                else:
+                    lat_med, lon_med = (lat0 + lat1) / 2, (lon0 + lon1) / 2
+            else:
+                lat_med, lon_med = geometric_median(centers[a:b], weights[a:b])
 
-            total_w = sum(wts)
-            errs    = [haversine((lat_med,lon_med), c) for c in centers]
-            loc_err = sum(w * e for w, e in zip(wts, errs)) / total_w
+            errs    = [haversine((lat_med,lon_med), c) for c in mac_centers]
+            loc_err = sum(w * e for w, e in zip(wts, errs)) / total_w[k]
 
             static_rows.append((
-                mac,
+                stat_wins[a].mac,
                 lat_med,
                 lon_med,
-                loc_err,
-                min(ts0_by_mac[mac]),
-                max(ts1_by_mac[mac]),
-                n_obs_by_mac[mac],
+                float(loc_err),
+                first_seen[k],
+                last_seen[k],
+                n_obs[k],
             ))
         return static_rows
     
-    def _decimate_mobile(self, mob_wins: list[Win]) -> list[MobileTrackPoint]:
+    def _decimate_mobile(self, obs: ObsTable, mob_wins: list[Win]) -> list[MobileTrackPoint]:
         """
         Decimate mobile tracks from visibility windows.
 
@@ -172,49 +338,41 @@ class ClassifierPipeline:
         List of (mac, timestamp, lat, lon) for each point in
         qualifying mobile tracks (≥2 points after decimation).
         """
-        
-        def _decimate_track(points: list[Obs]) -> list[MobileTrackPoint]:
-            """
-            Apply spatial and temporal decimation to a sorted Obs list.
-
-            Parameters
-            ----------
-            points
-                Observations sorted by timestamp.
-
-            Returns
-            -------
-            Decimated list of observations.
-            """
-            if not points:
-                return []
-
-            decimated: list[MobileTrackPoint] = [MobileTrackPoint(points[0].mac, points[0].ts, points[0].lat, points[0].lon)]
-            last = points[0]
-            for curr in points[1:]:
-                dt = curr.ts - last.ts
-                d = haversine((last.lat, last.lon), (curr.lat, curr.lon))
-                # only keep if far enough or long enough since last
-                if d >= self.cfg.mobile_decim_d or dt >= self.cfg.mobile_decim_t:
-                    speed = d / max(dt, 1)
-                    if speed <= self.cfg.max_speed_ms:
-                        decimated.append(MobileTrackPoint(curr.mac, curr.ts, curr.lat, curr.lon))
-                        last = curr
-            return decimated
-        
-        # group by MAC
-        pts_by_mac: dict[str, list[Obs]] = defaultdict(list)
-        for window in mob_wins:
-            pts_by_mac[window.mac].extend(window.points)
-        
-        # decimate each track
-        mobile_rows: list[MobileTrackPoint] = []
-        for mac, pts in pts_by_mac.items():
-            pts = sorted(pts, key=lambda o: o.ts)
-            decimated = _decimate_track(pts)
-            if len(decimated) >= 2:
-                mobile_rows.extend(decimated)
-        return mobile_rows
+        if not mob_wins:
+            return []
+
+        # mark the observations covered by mobile windows; a MAC's windows are
+        # already in timestamp order, so its track is the run of marked rows
+        delta = np.zeros(len(obs) + 1, dtype=np.int64)
+        np.add.at(delta, np.fromiter((w.start for w in mob_wins), dtype=np.int64), 1)
+        np.add.at(delta, np.fromiter((w.stop for w in mob_wins), dtype=np.int64), -1)
+        idx = np.flatnonzero(np.cumsum(delta[:-1]) > 0)
+
+        mac = obs.mac[idx]
+        ts = obs.ts[idx]
+        lat = obs.lat[idx]
+        lon = obs.lon[idx]
+        track_starts = np.flatnonzero(np.r_[True, mac[1:] != mac[:-1]])
+
+        keep = _decimate_tracks(
+            ts, lat, lon, track_starts,
+            float(self.cfg.mobile_decim_d),
+            int(self.cfg.mobile_decim_t),
+            float(self.cfg.max_speed_ms),
+        )
+
+        # discard tracks with fewer than two points left
+        n_kept = np.add.reduceat(keep.astype(np.int64), track_starts)
+        track_len = np.diff(np.append(track_starts, len(idx)))
+        keep &= np.repeat(n_kept >= 2, track_len)
+
+        names = obs.mac_names
+        return [
+            MobileTrackPoint(names[m], t, la, lo)
+            for m, t, la, lo in zip(
+                mac[keep].tolist(), ts[keep].tolist(), lat[keep].tolist(), lon[keep].tolist()
+            )
+        ]
     
     def _write_results(
         self,
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import List
+
+import numpy as np
 
 @dataclass
 class MobileTrackPoint:
@@ -27,28 +28,35 @@ class MobileTrackPoint:
     lon: float
 
 @dataclass
-class Obs:
+class ObsTable:
     """
-    Individual packet observation.
+    Columnar (struct-of-arrays) table of packet observations, sorted by (mac, ts).
 
     Parameters
     ----------
-    mac : str
-        MAC address of the observed device.
-    ts : int
-        Timestamp of the observation (seconds since epoch).
-    lat : float
-        Latitude in decimal degrees.
-    lon : float
-        Longitude in decimal degrees.
-    rssi : float
-        Received signal strength in dBm.
+    mac : np.ndarray
+        MAC addresses encoded as uint64 (see `wf.utils.mac.mac_to_int`).
+    ts : np.ndarray
+        Timestamps of the observations (int64 seconds since epoch).
+    lat : np.ndarray
+        Latitudes in decimal degrees (float64).
+    lon : np.ndarray
+        Longitudes in decimal degrees (float64).
+    power : np.ndarray
+        Linear received power ``10 ** (rssi / 10)`` (float32), used as the
+        observation weight.
+    mac_names : dict[int, str]
+        Original MAC address string for each encoded MAC.
     """
-    mac: str
-    ts: int
-    lat: float
-    lon: float
-    rssi: float
+    mac: np.ndarray
+    ts: np.ndarray
+    lat: np.ndarray
+    lon: np.ndarray
+    power: np.ndarray
+    mac_names: dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ts)
 
 @dataclass
 class Win:
@@ -63,10 +71,13 @@ class Win:
         Timestamp of the first observation in the window.
     ts_end : int
         Timestamp of the last observation in the window.
-    points : List[Obs]
-        Sequence of observations within the window.
+    start : int
+        Index of the first observation of the window in the `ObsTable`.
+    stop : int
+        Index one past the last observation of the window in the `ObsTable`.
     """
     mac: str
     ts_start: int
     ts_end: int
-    points: List[Obs] = field(default_factory=list)
\ No newline at end of file
+    start: int
+    stop: int
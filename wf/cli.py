@@ -15,32 +15,70 @@ import os
 import hashlib
 import uuid
 from argparse import ArgumentParser, Namespace
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from importlib.metadata import PackageNotFoundError, version as _get_version
 
 import uvicorn
 
 from wf.utils.log import get_logger
 from wf.storage.dao import DAO
+from wf.storage.db import init_db
 from wf.server import create_app
 from wf.parsers import kismet
 from wf.analysis.config import ClassifierConfig
 from wf.analysis.classifier import ClassifierPipeline
+from wf.utils.validate import Device, Observation, DrivePath
+from wf.utils.validate import DeviceRow, ObservationRow, DrivePathRow
 
 logger = get_logger(__name__)
 
 
-def _compute_sha256(file_path: str, chunk_size: int = 8192) -> str:
-    h = hashlib.sha256()
+def _compute_sha256(file_path: str) -> str:
     with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(chunk_size), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _file_sha256(dao: DAO, file_path: str) -> str:
+    """
+    Return the SHA256 of a file, reusing the cached digest when the file's
+    size and mtime are unchanged since it was last hashed.
+    """
+    path = os.path.abspath(file_path)
+    st = os.stat(path)
+    sha256 = dao.get_cached_sha256(path, st.st_size, st.st_mtime_ns)
+    if sha256 is None:
+        sha256 = _compute_sha256(path)
+        dao.cache_sha256(path, st.st_size, st.st_mtime_ns, sha256)
+    return sha256
+
+
+# rows parsed from one capture file, as returned by the ingest workers
+ParsedFile = tuple[list[DeviceRow], list[ObservationRow], list[DrivePathRow]]
+
+
+def _parse_file(file_path: str, session_id: str) -> ParsedFile:
+    """
+    Parse one raw capture file in a worker process.
+
+    Records are validated by the parser models here and flattened to
+    table-ordered tuples, which pickle far more cheaply than the models and
+    go straight into the DAO's raw bulk inserts.
+    """
+    devices_iter, obs_iter, paths_iter = kismet.parse_kismet(file_path, session_id)
+    return (
+        list(map(Device.to_tuple, devices_iter)),
+        list(map(Observation.to_tuple, obs_iter)),
+        list(map(DrivePath.to_tuple, paths_iter)),
+    )
 
 
 def ingest(mission: str, src_dir: str) -> None:
     """
     Ingest raw capture files into the Mission DB.
 
+    Files are parsed in parallel worker processes; all database writes stay
+    in this process, which holds the single SQLite writer.
+
     Parameters
     ----------
     mission
@@ -55,34 +93,71 @@ def ingest(mission: str, src_dir: str) -> None:
     # start with a clean drive_path
     dao.recreate_drive_path_table()
 
-    # Recursively find and ingest .kismet files
+    # Recursively find .kismet files not ingested yet
+    pending: list[tuple[str, str]] = []
+    seen: set[str] = set()
     for root, _, files in os.walk(src_dir):
         for filename in files:
             if not filename.endswith(".kismet"):
                 continue
             file_path = os.path.join(root, filename)
-            sha256 = _compute_sha256(file_path)
-            if dao.session_exists(sha256):
+            sha256 = _file_sha256(dao, file_path)
+            if sha256 in seen or dao.session_exists(sha256):
                 logger.info("Skipping already ingested file: %s", file_path)
                 continue
-
+            seen.add(sha256)
+            pending.append((file_path, sha256))
+    if not pending:
+        dao.close()
+        return
+
+    max_workers = min(os.cpu_count() or 1, len(pending))
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        queue = iter(pending)
+        in_flight: dict[Future[ParsedFile], tuple[str, str, str]] = {}
+
+        def _submit_next() -> None:
+            item = next(queue, None)
+            if item is None:
+                return
+            file_path, sha256 = item
             # Generate a new session ID
             session_id = str(uuid.uuid4())
-            
-            # Parse the file into normalized records (three generators)
-            devices_iter, obs_iter, paths_iter = kismet.parse_kismet(file_path, session_id)
-            
-            # Insert session metadata with dummy timestamps
-            dao.add_session(session_id, mission, file_path, sha256, 0, 0)
-            
-            # Batch‐insert observations, devices, and drive_path
-            dao.add_devices_bulk(devices_iter)
-            dao.add_observations_bulk(obs_iter)
-            dao.add_paths_bulk(paths_iter)
-            
-            # update session start/end timestamps
-            start_ts, end_ts = dao.get_session_time_bounds(session_id)
-            dao.update_session_times(session_id, start_ts, end_ts)
+            fut = ex.submit(_parse_file, file_path, session_id)
+            in_flight[fut] = (file_path, sha256, session_id)
+
+        # keep at most two parsed files per worker in memory at once
+        for _ in range(2 * max_workers):
+            _submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                file_path, sha256, session_id = in_flight.pop(fut)
+                devices, observations, paths = fut.result()
+                _submit_next()
+
+                # one commit per file covering the session and all its rows
+                with dao.transaction():
+                    # Insert session metadata with dummy timestamps; a file
+                    # committed by another ingest since the scan is skipped
+                    if not dao.add_session(session_id, mission, file_path, sha256, 0, 0):
+                        logger.info("Skipping already ingested file: %s", file_path)
+                        continue
+
+                    # Batch‐insert observations, devices, and drive_path
+                    dao.add_device_rows(devices)
+                    dao.add_observation_rows(observations)
+                    dao.add_path_rows(paths)
+
+                    # update session start/end timestamps
+                    start_ts, end_ts = dao.get_session_time_bounds(session_id)
+                    dao.update_session_times(session_id, start_ts, end_ts)
+                logger.info("Ingested %s", file_path)
+
+    # planner statistics once per ingest run, not per file
+    dao.analyze()
+    dao.close()
 
 
 def analyze(mission: str, from_ts: str | None, to_ts: str | None) -> None:
@@ -105,6 +180,7 @@ def analyze(mission: str, from_ts: str | None, to_ts: str | None) -> None:
     cfg = ClassifierConfig.driving()
     ClassifierPipeline(dao, cfg).run()
     # TODO: run atmospherics, stats population
+    dao.close()
 
 
 def export(mission: str, all: bool, cotravel: bool, stats: bool, outdir: str | None) -> None:
@@ -143,6 +219,8 @@ def serve(mission: str, port: int) -> None:
         Port on which to serve HTTP.
     """
     logger.info("Serve: mission=%s, port=%d", mission, port)
+    # create/migrate the schema once here; the server's readers open read-only
+    init_db(f"wf_{mission}.sqlite").close()
     # create an app bound to the mission
     app = create_app(mission)
     uvicorn.run(app, host="127.0.0.1", port=port)
@@ -3,12 +3,20 @@ Kismet parser: extract drive paths, device records, and packet observations from
 """
 
 import sqlite3
-import json
 from typing import Tuple, Optional, Iterator
 
+import orjson
+
 from wf.utils.validate import Device, Observation, DrivePath
 
 
+# channel for every 5 MHz channel centre in the bands handled below
+_FREQ_TO_CHANNEL: dict[int, int] = {
+    **{f: (f - 2407000) // 5000 for f in range(2412000, 2472001, 5000)},
+    **{f: (f - 5000000) // 5000 for f in range(5005000, 5825001, 5000)},
+}
+
+
 def frequency_to_channel(freq_hz: int) -> Optional[int]:
     """
     Convert frequency in Hz to Wi-Fi channel number.
@@ -23,6 +31,10 @@ def frequency_to_channel(freq_hz: int) -> Optional[int]:
     Optional[int]
         Wi-Fi channel number, or None if out of known bands.
     """
+    channel = _FREQ_TO_CHANNEL.get(freq_hz)
+    if channel is not None:
+        return channel
+    # off-grid frequencies fall back to the band formulas
     # 2.4 GHz band
     if 2412000 <= freq_hz <= 2472000:
         return int((freq_hz - 2407000) / 5000)
@@ -47,9 +59,9 @@ def is_mac_randomized(mac: str) -> bool:
         True if the locally-administered bit is set, False otherwise.
     """
     try:
-        first_octet = mac.split(":")[0]
-        val = int(first_octet, 16)
-    except (ValueError, IndexError):
+        # partition only splits off the first octet instead of all six
+        val = int(mac.partition(":")[0], 16)
+    except ValueError:
         return False
     # Locally administered bit is 0x02
     return bool(val & 0x02)
@@ -76,7 +88,7 @@ def _gen_devices(conn: sqlite3.Connection) -> Iterator[Device]:
         blob = row["device"]
         data = {}
         try:
-            data = json.loads(blob)
+            data = orjson.loads(blob)
         except (ValueError, TypeError):
             pass
         yield Device(
@@ -3,116 +3,186 @@
 FastAPI server for the wf CLI.
 """
 
+import hashlib
 import os
 from pathlib import Path
+from typing import Any, Callable
 
+import numpy as np
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from starlette.responses import JSONResponse
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
 
 from wf.utils.log import get_logger
-from wf.storage.dao import DAO
-from wf.utils.validate import DrivePath, StaticAP, MobileTrack, UIFilter
+from wf.storage.dao import DAO, DAOReaderPool
+from wf.utils.validate import StaticAP, UIFilter
 
 logger = get_logger(__name__)
 
+# serialized bodies kept per (endpoint, etag); least recently used are evicted first
+RESPONSE_CACHE_SIZE = 128
+
+# read-only connections shared by request handlers
+READER_POOL_SIZE = 4
+
+_static_ap_json = TypeAdapter(list[StaticAP])
+
+
+_STATUS_OK = orjson.dumps({"status": "ok"})
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSON response rendered with orjson instead of the stdlib encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def _etag(data_version: int, filter: UIFilter | None) -> str:
+    """
+    Build a weak ETag from the mission's data version and the request filter.
+    """
+    if filter is None:
+        return f'W/"{data_version}"'
+    digest = hashlib.blake2b(filter.model_dump_json().encode(), digest_size=8).hexdigest()
+    return f'W/"{data_version}-{digest}"'
+
+
+async def _conditional_json(
+    request: Request,
+    endpoint: str,
+    filter: UIFilter | None,
+    build: Callable[[DAO], bytes],
+) -> Response:
+    """
+    Answer 304 when the client already holds the current payload; otherwise
+    serve the JSON body, memoized until the data version changes.
+
+    Queries and serialization run in the threadpool, each on a connection
+    from the app's reader pool, so a slow query does not stall the event
+    loop or other requests; the cache itself is only touched on the loop.
+    """
+    readers: DAOReaderPool = request.app.state.readers
+    data_version = await run_in_threadpool(readers.run, DAO.get_data_version)
+    etag = _etag(data_version, filter)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    cache: dict[tuple[str, str], bytes] = request.app.state.response_cache
+    key = (endpoint, etag)
+    body = cache.pop(key, None)
+    if body is None:
+        body = await run_in_threadpool(readers.run, build)
+        if len(cache) >= RESPONSE_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+    # (re)insert at the end so dict order is least- to most-recently used
+    cache[key] = body
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def _columns_json(columns: tuple[np.ndarray, np.ndarray, np.ndarray]) -> bytes:
+    """
+    Serialize (ts, lat, lon) columns as {"ts": [...], "lat": [...], "lon": [...]}.
+    """
+    ts, lat, lon = columns
+    return orjson.dumps({"ts": ts, "lat": lat, "lon": lon}, option=orjson.OPT_SERIALIZE_NUMPY)
+
 
 def create_app(mission: str) -> FastAPI:
     """
     Build a FastAPI instance bound to a specific mission.
     """
-    app = FastAPI()
+    app = FastAPI(default_response_class=OrjsonResponse)
     app.state.mission = mission
+    # long-lived connections for all requests instead of reopening per endpoint
+    app.state.readers = DAOReaderPool(f"wf_{mission}.sqlite", READER_POOL_SIZE)
+    app.state.response_cache = {}
+    # constant for the lifetime of the app
+    mission_body = orjson.dumps({"mission": mission})
 
     # mount all API endpoints first
-    @app.get("/api/status", response_class=JSONResponse)
-    async def status() -> JSONResponse:
-        return JSONResponse(status_code=200, content={"status": "ok"})
+    @app.get("/api/status")
+    async def status() -> Response:
+        return Response(content=_STATUS_OK, media_type="application/json")
 
-    @app.get("/api/mission", response_class=JSONResponse)
-    async def get_mission(request: Request) -> JSONResponse:
-        return JSONResponse(status_code=200, content={"mission": request.app.state.mission})
+    @app.get("/api/mission")
+    async def get_mission(request: Request) -> Response:
+        return Response(content=mission_body, media_type="application/json")
 
-    @app.get("/api/max-packets", response_class=JSONResponse)
-    async def get_max_packets(request: Request) -> JSONResponse:
+    @app.get("/api/max-packets")
+    async def get_max_packets(request: Request) -> Response:
         """
         return min and max packet counts across static aps and mobile tracks.
         """
-        mission = request.app.state.mission
-        dao = DAO(f"wf_{mission}.sqlite")
-        max_packets = dao.get_max_packets()
-        return JSONResponse(
-            status_code=200, 
-            content={"max_packets": max_packets}
+        return await _conditional_json(
+            request, "max-packets", None,
+            lambda dao: orjson.dumps({"max_packets": dao.get_max_packets()}),
         )
     
-    @app.get("/api/max-points", response_class=JSONResponse)
-    async def get_max_points(request: Request) -> JSONResponse:
+    @app.get("/api/max-points")
+    async def get_max_points(request: Request) -> Response:
         """
         return min and max number of points per mobile track.
         """
-        mission = request.app.state.mission
-        dao = DAO(f"wf_{mission}.sqlite")
-        max_pts = dao.get_max_mobile_points()
-        return JSONResponse(
-            status_code=200, 
-            content={"max_points": max_pts}
+        return await _conditional_json(
+            request, "max-points", None,
+            lambda dao: orjson.dumps({"max_points": dao.get_max_mobile_points()}),
         )
 
-    @app.get("/api/time-range", response_class=JSONResponse)
-    async def get_time_range(request: Request) -> JSONResponse:
+    @app.get("/api/time-range")
+    async def get_time_range(request: Request) -> Response:
         """
         return min and max timestamps across sessions.
         """
-        mission = request.app.state.mission
-        dao = DAO(f"wf_{mission}.sqlite")
-        min_ts, max_ts = dao.get_time_range()
-        return JSONResponse(
-            status_code=200, 
-            content={
-                "min_ts": min_ts,
-                "max_ts": max_ts
-        })
-
-    @app.post("/api/drive-path", response_model=list[DrivePath])
-    async def get_drive_path(request: Request, filter: UIFilter):
-        mission = request.app.state.mission
-        dao = DAO(f"wf_{mission}.sqlite")
-        return dao.get_drive_path(filter)
-
-    @app.post("/api/static-ap", response_model=list[StaticAP])
-    async def get_static_ap(request: Request, filter: UIFilter):
-        mission = request.app.state.mission
-        dao = DAO(f"wf_{mission}.sqlite")
-        return dao.get_static_ap(filter)
-
-    @app.post("/api/mobile-track", response_model=list[MobileTrack])
-    async def get_mobile_track(request: Request, filter: UIFilter):
-        mission = request.app.state.mission
-        dao = DAO(f"wf_{mission}.sqlite")
-        return dao.get_mobile_tracks(filter)
-
-    @app.post("/api/atmos", response_class=JSONResponse)
-    async def get_atmos(request: Request, filter: UIFilter):
+        def build(dao: DAO) -> bytes:
+            min_ts, max_ts = dao.get_time_range()
+            return orjson.dumps({"min_ts": min_ts, "max_ts": max_ts})
+
+        return await _conditional_json(request, "time-range", None, build)
+
+    @app.get("/api/filter-ranges")
+    async def get_filter_ranges(request: Request) -> Response:
+        """
+        return max-packets, max-points and time-range bounds in one response.
+        """
+        return await _conditional_json(
+            request, "filter-ranges", None,
+            lambda dao: orjson.dumps(dao.get_filter_ranges()),
+        )
+
+    @app.post("/api/drive-path")
+    async def get_drive_path(request: Request, filter: UIFilter) -> Response:
+        return await _conditional_json(
+            request, "drive-path", filter,
+            lambda dao: _columns_json(dao.get_drive_path_columns(filter)),
+        )
+
+    @app.post("/api/static-ap")
+    async def get_static_ap(request: Request, filter: UIFilter) -> Response:
+        return await _conditional_json(
+            request, "static-ap", filter,
+            lambda dao: _static_ap_json.dump_json(dao.get_static_ap(filter)),
+        )
+
+    @app.post("/api/mobile-track")
+    async def get_mobile_track(request: Request, filter: UIFilter) -> Response:
+        return await _conditional_json(
+            request, "mobile-track", filter,
+            lambda dao: orjson.dumps(dao.get_mobile_track_dicts(filter)),
+        )
+
+    @app.post("/api/atmos")
+    async def get_atmos(request: Request, filter: UIFilter) -> Response:
         """
         Return summary statistics based on the UI filter
         """
-        mission = request.app.state.mission
-        dao = DAO(f"wf_{mission}.sqlite")
-        enc = dao.get_encryption_counts(filter)
-        mac = dao.get_mac_counts(filter)
-        unique_macs = dao.get_unique_mac_count(filter)
-        unique_ssids = dao.get_unique_ssid_count(filter)
-        oui = dao.get_oui_counts(filter)
-        return JSONResponse(
-            status_code=200,
-            content={
-                "encryption_counts": enc,
-                "oui_counts": oui,
-                "unique_mac_count": unique_macs,
-                "unique_ssid_count": unique_ssids,
-                "mac_counts": mac,
-            },
+        return await _conditional_json(
+            request, "atmos", filter,
+            lambda dao: orjson.dumps(dao.get_atmos(filter)),
         )
 
     # mount the static UI last
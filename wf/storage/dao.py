@@ -1,23 +1,179 @@
-from sqlite3 import Connection
-from typing import Iterable
+import math
+from collections import Counter
+from contextlib import contextmanager
+from itertools import islice
+from operator import itemgetter
+from queue import SimpleQueue
+from sqlite3 import Connection, Cursor, Row
+from typing import Callable, Iterable, Iterator, TypedDict, TypeVar
+
+import numpy as np
+import orjson
+
 from wf.utils.validate import Device, Observation, DrivePath, StaticAP, MobileTrack, UIFilter
-from wf.storage.db import init_db
+from wf.utils.validate import MobileTrackPoint as TrackPoint
+from wf.utils.validate import DeviceRow, ObservationRow, DrivePathRow
+from wf.storage.db import get_connection, init_db
+from wf.utils.geo import point_in_polygon
 from wf.utils.log import get_logger
 from wf.analysis.types import MobileTrackPoint
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# observation rows bound per executemany() call during bulk inserts
+INSERT_BATCH_SIZE = 50_000
+
+# drive path rows converted to arrays per fetchmany() call
+DRIVE_PATH_BATCH_SIZE = 50_000
+
+# encryption protocols reported by the dashboard ("" for unknown)
+_ENCRYPTION_PROTOCOLS = ("", "Open", "WEP", "WPA", "WPA2", "WPA3")
+
+
+def _encryption_protocol_sql(col: str) -> str:
+    """
+    SQL expression reducing an encryption column to its protocol: the first
+    space-separated word, with "WPA1" read as "WPA". Callers restrict the
+    result to `_ENCRYPTION_PROTOCOLS` where only reported protocols count.
+    """
+    first = f"CASE WHEN instr({col}, ' ') > 0 THEN substr({col}, 1, instr({col}, ' ') - 1) ELSE {col} END"
+    return f"(CASE {first} WHEN 'WPA1' THEN 'WPA' ELSE {first} END)"
+
+
+class AtmosSummary(TypedDict):
+    """
+    Atmospherics dashboard payload returned by `DAO.get_atmos`.
+    """
+    encryption_counts: list[tuple[str, int]]
+    oui_counts: list[tuple[str | None, int]]
+    unique_mac_count: int
+    unique_ssid_count: int
+    mac_counts: list[tuple[str, str | None, int]]
+
+
+class TrackPointDict(TypedDict):
+    """
+    One decimated point of a `MobileTrackDict`.
+    """
+    ts: int
+    lat: float
+    lon: float
+
+
+class MobileTrackDict(TypedDict):
+    """
+    Mobile track payload returned by `DAO.get_mobile_track_dicts`, shaped
+    like MobileTrack.
+    """
+    mac: str
+    ssid: str | None
+    encryption: str | None
+    oui_manuf: str | None
+    is_randomized: bool
+    device_type: str | None
+    n_obs: int
+    points: list[TrackPointDict]
+
 
 class DAO:
     """
     Encapsulates all inserts/queries against our Wi-Fi forensics DB.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, read_only: bool = False):
         """
         Create/connect and apply schema if needed.
+
+        A read-only DAO opens the existing database with `mode=ro` and leaves
+        schema creation and migration to writers; it may be shared across
+        threads (e.g. one per server process rather than one per request).
+        """
+        self.conn: Connection = (
+            get_connection(db_path, check_same_thread=False, read_only=True)
+            if read_only
+            else init_db(db_path)
+        )
+        self.read_only = read_only
+        self._tx_depth = 0
+
+    def analyze(self) -> None:
+        """
+        Refresh the query planner's statistics after a bulk load.
+
+        Sampling is capped per index so this stays cheap on large missions.
+        """
+        self.conn.execute("PRAGMA analysis_limit = 1000;")
+        self.conn.execute("ANALYZE;")
+
+    def close(self) -> None:
+        """
+        Let SQLite refresh any statistics it considers stale, then close.
+        """
+        if not self.read_only:
+            self.conn.execute("PRAGMA optimize;")
+        self.conn.close()
+
+    def _tuple_query(self, sql: str, params: Iterable[object] = ()) -> Cursor:
+        """
+        Execute a read whose rows are unpacked positionally.
+
+        The cursor yields plain tuples rather than sqlite3.Row, so no
+        per-row name lookups are paid; the connection's default row
+        factory is left untouched for other (possibly concurrent) readers.
+        """
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(sql, tuple(params))
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
         """
-        self.conn: Connection = init_db(db_path)
+        Group writes into one transaction, committed (or rolled back) on exit.
+
+        Nested uses join the outermost transaction, so callers can wrap many
+        single-row or bulk writes and pay for one commit.
+        """
+        if self._tx_depth:
+            self._tx_depth += 1
+            try:
+                yield
+            finally:
+                self._tx_depth -= 1
+            return
+        self._tx_depth = 1
+        # take the write lock up front so a concurrent reader can't force a
+        # busy upgrade halfway through the batch
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
+        finally:
+            self._tx_depth = 0
+
+    def _bump_data_version(self) -> None:
+        """
+        Mark served data as changed; call inside the writing transaction.
+        """
+        # upserted here rather than seeded by the schema, so only writers touch meta
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('data_version', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+
+    def get_data_version(self) -> int:
+        """
+        Return the counter bumped by every write to data served by the API
+        (0 until the first such write).
+        """
+        cursor = self.conn.execute("SELECT value FROM meta WHERE key = 'data_version'")
+        row = cursor.fetchone()
+        return row["value"] if row else 0
 
     def add_session(
         self,
@@ -27,19 +183,29 @@ class DAO:
         sha256: str,
         start_ts: int,
         end_ts: int,
-    ) -> None:
+    ) -> bool:
         """
         Insert a new raw-file session.
+
+        Returns
+        -------
+        bool
+            True if the session was added, False if a session with the same
+            SHA256 already exists (the file was ingested before).
         """
-        self.conn.execute(
-            """
-            INSERT INTO sessions
-              (id, mission, src_file, sha256, start_ts, end_ts)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (session_id, mission, src_file, sha256, start_ts, end_ts),
-        )
-        self.conn.commit()
+        with self.transaction():
+            cursor = self.conn.execute(
+                """
+                INSERT OR IGNORE INTO sessions
+                  (id, mission, src_file, sha256, start_ts, end_ts)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (session_id, mission, src_file, sha256, start_ts, end_ts),
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._bump_data_version()
+        return True
 
     def session_exists(self, sha256: str) -> bool:
         """
@@ -51,6 +217,34 @@ class DAO:
         )
         return cursor.fetchone() is not None
 
+    def get_cached_sha256(self, path: str, size: int, mtime_ns: int) -> str | None:
+        """
+        Return the cached SHA256 of a file if its size and mtime are unchanged.
+        """
+        cursor = self.conn.execute(
+            "SELECT sha256 FROM file_hash_cache WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (path, size, mtime_ns),
+        )
+        row = cursor.fetchone()
+        return row["sha256"] if row else None
+
+    def cache_sha256(self, path: str, size: int, mtime_ns: int, sha256: str) -> None:
+        """
+        Insert or refresh the cached SHA256 of a file.
+        """
+        with self.transaction():
+            self.conn.execute(
+                """
+                INSERT INTO file_hash_cache (path, size, mtime_ns, sha256)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                  size     = excluded.size,
+                  mtime_ns = excluded.mtime_ns,
+                  sha256   = excluded.sha256
+                """,
+                (path, size, mtime_ns, sha256),
+            )
+
     def upsert_device(
         self,
         device: Device,
@@ -58,7 +252,7 @@ class DAO:
         """
         Insert a new device or update first_ts/last_ts and other fields.
         """
-        with self.conn:
+        with self.transaction():
             self.conn.execute(
                 """
                 INSERT INTO devices
@@ -72,17 +266,9 @@ class DAO:
                   is_randomized= excluded.is_randomized,
                   ssid         = excluded.ssid
                 """,
-                (
-                    device.mac,
-                    device.type,
-                    device.first_ts,
-                    device.last_ts,
-                    device.oui_manuf,
-                    device.encryption,
-                    int(device.is_randomized),
-                    device.ssid,
-                ),
+                device.to_tuple(),
             )
+            self._bump_data_version()
 
     def add_observation(
         self,
@@ -91,36 +277,49 @@ class DAO:
         """
         Record a single probe/AP sighting.
         """
-        self.conn.execute(
-            """
-            INSERT INTO observations
-              (mac, session_id, ts, lat, lon, rssi, channel)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                obs.mac,
-                obs.session_id,
-                obs.ts,
-                obs.lat,
-                obs.lon,
-                obs.rssi,
-                obs.channel,
-            ),
-        )
-        self.conn.commit()
-        # if obs.lat is not None and obs.lon is not None:
-        #     # maintain spatial index
-        #     rowid = self.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
-        #     self.conn.execute(
-        #         "INSERT INTO obs_rtree (id, min_lat, min_lon, max_lat, max_lon) VALUES (?, ?, ?, ?, ?)",
-        #         (rowid, obs.lat, obs.lon, obs.lat, obs.lon),
-        #     )
-        #     self.conn.commit()
+        with self.transaction():
+            self.conn.execute(
+                """
+                INSERT INTO observations
+                  (mac, session_id, ts, lat, lon, rssi, channel)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    obs.mac,
+                    obs.session_id,
+                    obs.ts,
+                    obs.lat,
+                    obs.lon,
+                    obs.rssi,
+                    obs.channel,
+                ),
+            )
+            if obs.lat is not None and obs.lon is not None:
+                self.conn.execute(
+                    "INSERT INTO obs_rtree (id, min_lat, max_lat, min_lon, max_lon) "
+                    "VALUES (last_insert_rowid(), ?, ?, ?, ?)",
+                    (obs.lat, obs.lat, obs.lon, obs.lon),
+                )
+            self.conn.execute(
+                """
+                INSERT INTO device_obs_count (mac, n_obs) VALUES (?, 1)
+                ON CONFLICT(mac) DO UPDATE SET n_obs = n_obs + 1
+                """,
+                (obs.mac,),
+            )
+            self._bump_data_version()
 
     def add_devices_bulk(self, devices: Iterable[Device]) -> None:
         """
         Bulk upsert devices in a single transaction.
         """
+        self.add_device_rows(map(Device.to_tuple, devices))
+
+    def add_device_rows(self, rows: Iterable[DeviceRow]) -> None:
+        """
+        Bulk upsert raw device tuples in a single transaction.
+        rows: (mac, type, first_ts, last_ts, oui_manuf, encryption, is_randomized, ssid)
+        """
         stmt = """
         INSERT INTO devices
           (mac, type, first_ts, last_ts, oui_manuf, encryption, is_randomized, ssid)
@@ -133,103 +332,118 @@ class DAO:
           is_randomized = excluded.is_randomized,
           ssid          = excluded.ssid
         """
-        params = (
-            (
-                d.mac,
-                d.type,
-                d.first_ts,
-                d.last_ts,
-                d.oui_manuf,
-                d.encryption,
-                int(d.is_randomized),
-                d.ssid,
-            )
-            for d in devices
-        )
-        with self.conn:
-            self.conn.executemany(stmt, params)
+        # coalesce repeated macs first, merging them exactly as the upsert
+        # would, so each mac costs one b-tree seek
+        agg: dict[str, DeviceRow] = {}
+        for row in rows:
+            mac = row[0]
+            prev = agg.get(mac)
+            if prev is not None:
+                # type is kept from the first row; sql MIN/MAX yield NULL if either side is NULL
+                first_ts = None if prev[2] is None or row[2] is None else min(prev[2], row[2])
+                last_ts = None if prev[3] is None or row[3] is None else max(prev[3], row[3])
+                row = (mac, prev[1], first_ts, last_ts, *row[4:])
+            agg[mac] = row
+        with self.transaction():
+            self.conn.executemany(stmt, list(agg.values()))
+            self._bump_data_version()
 
     def add_observations_bulk(self, observations: Iterable[Observation]) -> None:
         """
-        Bulk insert observations and their spatial‐index entries
-        in a single transaction.
+        Bulk insert observations in a single transaction.
+        """
+        self.add_observation_rows(map(Observation.to_tuple, observations))
+
+    def add_observation_rows(self, rows: Iterable[ObservationRow]) -> None:
+        """
+        Bulk insert raw observation tuples in a single transaction.
+        rows: (mac, session_id, ts, lat, lon, rssi, channel, frequency)
         """
         sql_obs = """
         INSERT INTO observations
           (mac, session_id, ts, lat, lon, rssi, channel, frequency)
         VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         """
+        sql_count = """
+        INSERT INTO device_obs_count (mac, n_obs) VALUES (?, ?)
+        ON CONFLICT(mac) DO UPDATE SET n_obs = n_obs + excluded.n_obs
+        """
+        # ids are autoincrement, so the new rows are exactly those past this one
         sql_rtree = """
-        INSERT INTO obs_rtree
-          (id, min_lat, min_lon, max_lat, max_lon)
-        VALUES (?, ?, ?, ?, ?)
-        """
-        with self.conn:
-            for obs in observations:
-                cur = self.conn.execute(
-                    sql_obs,
-                    (
-                        obs.mac,
-                        obs.session_id,
-                        obs.ts,
-                        obs.lat,
-                        obs.lon,
-                        obs.rssi,
-                        obs.channel,
-                        obs.frequency,
-                    ),
-                )
-                # if obs.lat is not None and obs.lon is not None:
-                #     self.conn.execute(
-                #         sql_rtree,
-                #         (cur.lastrowid, obs.lat, obs.lon, obs.lat, obs.lon),
-                #     )
+        INSERT INTO obs_rtree (id, min_lat, max_lat, min_lon, max_lon)
+        SELECT id, lat, lat, lon, lon FROM observations
+        WHERE id > ? AND lat IS NOT NULL AND lon IS NOT NULL
+        """
+        counts: Counter[str | None] = Counter()
+        rows = iter(rows)
+        with self.transaction():
+            last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM observations").fetchone()[0]
+            # bounded slices keep a streamed iterable from being materialized
+            # whole; the statement text is shared so its plan is reused
+            while chunk := list(islice(rows, INSERT_BATCH_SIZE)):
+                self.conn.executemany(sql_obs, chunk)
+                counts.update(row[0] for row in chunk)
+            # one counter update per distinct mac, not per observation
+            self.conn.executemany(sql_count, counts.items())
+            # index the whole batch in one statement rather than per row
+            self.conn.execute(sql_rtree, (last_id,))
+            self._bump_data_version()
 
     def add_paths_bulk(self, paths: Iterable[DrivePath]) -> None:
         """
         Bulk insert drive_path points in a single transaction.
         """
-        with self.conn:
+        self.add_path_rows(map(DrivePath.to_tuple, paths))
+
+    def add_path_rows(self, rows: Iterable[DrivePathRow]) -> None:
+        """
+        Bulk insert raw drive_path tuples in a single transaction.
+        rows: (ts, lat, lon)
+        """
+        with self.transaction():
             self.conn.executemany(
                 "INSERT OR IGNORE INTO drive_path (ts, lat, lon) VALUES (?, ?, ?)",
-                ((p.ts, p.lat, p.lon) for p in paths),
+                rows,
             )
+            self._bump_data_version()
 
     def add_device_location(self, mac: str, ts: int, lat: float, lon: float) -> None:
         """
         Store a raw GPS fix for a device.
         """
-        self.conn.execute(
-            """
-            INSERT INTO device_locations (mac, ts, lat, lon)
-            VALUES (?, ?, ?, ?)
-            """,
-            (mac, ts, lat, lon),
-        )
-        self.conn.commit()
+        with self.transaction():
+            self.conn.execute(
+                """
+                INSERT INTO device_locations (mac, ts, lat, lon)
+                VALUES (?, ?, ?, ?)
+                """,
+                (mac, ts, lat, lon),
+            )
 
     def recreate_drive_path_table(self) -> None:
         """
         Drop and re-create the drive_path table.
         """
-        self.conn.execute("DROP TABLE IF EXISTS drive_path")
-        self.conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS drive_path (
-                ts      INTEGER PRIMARY KEY,
-                lat     REAL    NOT NULL,
-                lon     REAL    NOT NULL
+        with self.transaction():
+            self.conn.execute("DROP TABLE IF EXISTS drive_path")
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS drive_path (
+                    ts      INTEGER PRIMARY KEY,
+                    lat     REAL    NOT NULL,
+                    lon     REAL    NOT NULL
+                )
+                """
             )
-            """
-        )
-        self.conn.commit()
+            self._bump_data_version()
 
     def recreate_classification_tables(self) -> None:
         """
         Drop & re-create the static_ap and mobile_track tables.
         """
-        with self.conn:
+        with self.transaction():
             self.conn.execute("DROP TABLE IF EXISTS static_ap")
+            self.conn.execute("DELETE FROM static_ap_rtree")
             self.conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS static_ap (
@@ -255,6 +469,8 @@ class DAO:
                 )
                 """
             )
+            self._set_meta("max_mobile_points", 0)
+            self._bump_data_version()
 
     def add_static_ap_bulk(
         self, rows: list[tuple[str, float, float, float, int, int, int]]
@@ -275,8 +491,17 @@ class DAO:
           last_seen   = excluded.last_seen,
           n_obs       = excluded.n_obs
         """
-        with self.conn:
+        # the batch's macs are passed as one json array so the r*tree is
+        # refreshed by a single insert-select rather than a statement per row
+        sql_rtree = """
+        INSERT OR REPLACE INTO static_ap_rtree (id, min_lat, max_lat, min_lon, max_lon)
+        SELECT rowid, lat_mean, lat_mean, lon_mean, lon_mean FROM static_ap
+        WHERE mac IN (SELECT value FROM json_each(?))
+        """
+        with self.transaction():
             self.conn.executemany(sql, rows)
+            self.conn.execute(sql_rtree, (orjson.dumps([row[0] for row in rows]).decode(),))
+            self._bump_data_version()
 
     def add_mobile_track_bulk(self, rows: list[MobileTrackPoint]) -> None:
         """
@@ -284,18 +509,22 @@ class DAO:
         rows: (mac, ts, lat, lon)
         """
         sql = "INSERT OR REPLACE INTO mobile_track (mac, ts, lat, lon) VALUES (?, ?, ?, ?)"
-        with self.conn:
-            self.conn.executemany(sql, ((row.mac, row.ts, row.lat, row.lon) for row in rows))
+        params = [(row.mac, row.ts, row.lat, row.lon) for row in rows]
+        with self.transaction():
+            self.conn.executemany(sql, params)
+            self._set_meta("max_mobile_points", self._count_max_mobile_points())
+            self._bump_data_version()
 
     def add_path(self, path: DrivePath) -> None:
         """
         Store a single GPS snapshot.
         """
-        self.conn.execute(
-            "INSERT INTO drive_path (ts, lat, lon) VALUES (?, ?, ?)",
-            (path.ts, path.lat, path.lon),
-        )
-        self.conn.commit()
+        with self.transaction():
+            self.conn.execute(
+                "INSERT INTO drive_path (ts, lat, lon) VALUES (?, ?, ?)",
+                (path.ts, path.lat, path.lon),
+            )
+            self._bump_data_version()
 
     def get_session_time_bounds(self, session_id: str) -> tuple[int, int]:
         """
@@ -312,27 +541,46 @@ class DAO:
         """
         Patch the session row with computed start/end.
         """
-        self.conn.execute(
-            "UPDATE sessions SET start_ts = ?, end_ts = ? WHERE id = ?",
-            (start_ts, end_ts, session_id),
+        with self.transaction():
+            self.conn.execute(
+                "UPDATE sessions SET start_ts = ?, end_ts = ? WHERE id = ?",
+                (start_ts, end_ts, session_id),
+            )
+            self._bump_data_version()
+
+    def count_located_observations(self) -> int:
+        """
+        Return the number of observations with a GPS fix (duplicates included).
+        """
+        cursor = self.conn.execute(
+            "SELECT COUNT(*) FROM observations WHERE lat IS NOT NULL AND lon IS NOT NULL"
         )
-        self.conn.commit()
+        count: int = cursor.fetchone()[0]
+        return count
+
+    def iter_located_observations(self, batch_size: int = 100_000) -> Iterator[list[Row]]:
+        """
+        Stream deduplicated (mac, ts, lat, lon, rssi) rows that have a GPS fix,
+        ordered by (mac, ts), in batches of at most `batch_size` rows.
+        """
+        # grouping and ordering on the full index key lets SQLite dedup and sort
+        # straight off idx_obs_dedup, with no temp b-tree
+        cursor = self.conn.execute(
+            "SELECT mac, ts, lat, lon, rssi FROM observations "
+            "WHERE lat IS NOT NULL AND lon IS NOT NULL "
+            "GROUP BY mac, ts, lat, lon, rssi "
+            "ORDER BY mac, ts, lat, lon, rssi"
+        )
+        cursor.arraysize = batch_size
+        while batch := cursor.fetchmany():
+            yield batch
 
     def get_max_packets(self) -> int:
         """
         return min and max packet counts across static aps and mobile tracks.
         """
         cursor = self.conn.execute(
-            """
-            WITH packet_counts AS (
-                SELECT mac, count(1) AS count 
-                FROM observations 
-                GROUP BY mac    
-            )
-            SELECT 
-                coalesce(max(count), 0) AS max_cnt
-            FROM packet_counts
-            """
+            "SELECT COALESCE(MAX(n_obs), 0) AS max_cnt FROM device_obs_count"
         )
         row = cursor.fetchone()
         return row["max_cnt"]
@@ -341,6 +589,19 @@ class DAO:
         """
         return min and max number of points per mobile track.
         """
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'max_mobile_points'"
+        ).fetchone()
+        if row is not None:
+            max_points: int = row["value"]
+            return max_points
+        # databases analyzed before the stat was kept
+        return self._count_max_mobile_points()
+
+    def _count_max_mobile_points(self) -> int:
+        """
+        Count the points of the longest mobile track.
+        """
         cursor = self.conn.execute(
             """
             WITH pt_counts AS (
@@ -356,6 +617,16 @@ class DAO:
         row = cursor.fetchone()
         return row["max_pts"]
 
+    def _set_meta(self, key: str, value: int) -> None:
+        """
+        Store a mission-wide integer; call inside the writing transaction.
+        """
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
     def get_time_range(self) -> tuple[int, int]:
         """
         return min start_ts and max end_ts across all sessions.
@@ -366,9 +637,30 @@ class DAO:
         row = cursor.fetchone()
         return row["min_ts"], row["max_ts"]
 
-    def get_drive_path(self, filter: UIFilter) -> list[DrivePath]:
+    def get_filter_ranges(self) -> dict[str, int]:
         """
-        Return list of DrivePath points sorted by timestamp.
+        Return the UI slider bounds in one round trip: max_packets,
+        max_points, min_ts and max_ts, as the individual getters report them.
+        """
+        row = self.conn.execute(
+            """
+            SELECT
+              (SELECT COALESCE(MAX(n_obs), 0) FROM device_obs_count) AS max_packets,
+              COALESCE(
+                (SELECT value FROM meta WHERE key = 'max_mobile_points'),
+                (SELECT MAX(n_pts) FROM (SELECT COUNT(*) AS n_pts FROM mobile_track GROUP BY mac)),
+                0
+              ) AS max_points,
+              (SELECT COALESCE(MIN(start_ts), 0) FROM sessions) AS min_ts,
+              (SELECT COALESCE(MAX(end_ts), 0) FROM sessions) AS max_ts
+            """
+        ).fetchone()
+        return dict(row)
+
+    def _drive_path_cursor(self, filter: UIFilter) -> Cursor:
+        """
+        Execute the drive path query and return a tuple-row cursor over
+        (ts, lat, lon), sorted by timestamp.
         """
         sql = "SELECT ts, lat, lon FROM drive_path"
         params: list[int] = []
@@ -376,9 +668,80 @@ class DAO:
             sql += " WHERE ts BETWEEN ? AND ?"
             params.extend(filter.time_range)
         sql += " ORDER BY ts"
-        cursor = self.conn.execute(sql, tuple(params))
-        rows = cursor.fetchall()
-        return [DrivePath(ts=row["ts"], lat=row["lat"], lon=row["lon"]) for row in rows]
+        return self._tuple_query(sql, params)
+
+    def get_drive_path_rows(self, filter: UIFilter) -> list[tuple[int, float, float]]:
+        """
+        Return (ts, lat, lon) drive path tuples sorted by timestamp.
+        """
+        return self._drive_path_cursor(filter).fetchall()
+
+    def get_drive_path_columns(
+        self, filter: UIFilter, batch_size: int = DRIVE_PATH_BATCH_SIZE
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the drive path as (ts, lat, lon) column arrays sorted by timestamp.
+
+        Rows are pulled from the cursor `batch_size` at a time and packed into
+        arrays as they arrive, so at most one batch of row tuples is alive at
+        once rather than the whole path.
+        """
+        cursor = self._drive_path_cursor(filter)
+        chunks: list[np.ndarray] = []
+        while batch := cursor.fetchmany(batch_size):
+            chunks.append(np.array(batch, dtype=np.float64).reshape(-1, 3))
+        if not chunks:
+            return np.empty(0, np.int64), np.empty(0, np.float64), np.empty(0, np.float64)
+        table = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+        # ts round-trips exactly: epoch seconds are far below 2**53
+        return (
+            table[:, 0].astype(np.int64),
+            np.ascontiguousarray(table[:, 1]),
+            np.ascontiguousarray(table[:, 2]),
+        )
+
+    def get_drive_path(self, filter: UIFilter) -> list[DrivePath]:
+        """
+        Return list of DrivePath points sorted by timestamp.
+        """
+        # columns are typed by the schema, so skip per-point validation
+        return [
+            DrivePath.model_construct(ts=ts, lat=lat, lon=lon)
+            for ts, lat, lon in self.get_drive_path_rows(filter)
+        ]
+
+    def get_observations_in_area(self, polygon: list[tuple[float, float]]) -> list[Observation]:
+        """
+        Return the observations located inside a polygon.
+
+        Candidates are pruned to the polygon's bounding box through obs_rtree
+        and then tested against the polygon itself.
+
+        Parameters
+        ----------
+        polygon
+            Vertices as (latitude, longitude) pairs, as in `UIFilter.area`.
+        """
+        lats = [p[0] for p in polygon]
+        lons = [p[1] for p in polygon]
+        # overlap rather than containment, since r*tree bounds are rounded outward
+        sql = """
+            SELECT o.mac, o.session_id, o.ts, o.lat, o.lon, o.rssi, o.channel, o.frequency
+            FROM obs_rtree r
+            JOIN observations o ON o.id = r.id
+            WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?
+            ORDER BY o.id
+            """
+        params = (min(lats), max(lats), min(lons), max(lons))
+        return [
+            Observation.model_construct(
+                mac=mac, session_id=session_id, ts=ts, lat=lat, lon=lon,
+                rssi=rssi, channel=channel, frequency=frequency,
+            )
+            for mac, session_id, ts, lat, lon, rssi, channel, frequency
+            in self._tuple_query(sql, params)
+            if point_in_polygon(lat, lon, polygon)
+        ]
 
     def get_static_ap(self, filter: UIFilter) -> list[StaticAP]:
         """
@@ -401,109 +764,175 @@ class DAO:
             FROM static_ap
             LEFT JOIN devices ON static_ap.mac = devices.mac
             """
-        params: list[int] = []
+        clauses, params = self._device_filter(filter, "static_ap.mac", "devices")
         if filter.time_range:
-            sql += " WHERE first_seen >= ? AND last_seen <= ?"
+            clauses.append("first_seen >= ? AND last_seen <= ?")
             params.extend(filter.time_range)
         if filter.packet_count:
-            sql += " AND n_obs BETWEEN ? AND ?"
+            clauses.append("n_obs BETWEEN ? AND ?")
             params.extend(filter.packet_count)
-        # TODO: add mac/ssid/encryption/area filters here
-        cursor = self.conn.execute(sql, tuple(params))
-        rows = cursor.fetchall()
-        return [
-            StaticAP(
-                mac=row["mac"],
-                lat_mean=row["lat_mean"],
-                lon_mean=row["lon_mean"],
-                loc_error_m=row["loc_error_m"],
-                first_seen=row["first_seen"],
-                last_seen=row["last_seen"],
-                n_obs=row["n_obs"],
-                ssid=row["ssid"],
-                encryption=row["encryption"],
-                oui_manuf=row["oui_manuf"],
-                is_randomized=row["is_randomized"],
-                type=row["type"],
-            )
-            for row in rows
-        ]
+        if filter.area:
+            # prune by the polygon's bounding box through the r*tree; the
+            # overlap test is used because r*tree bounds are rounded outward
+            sql += " JOIN static_ap_rtree r ON r.id = static_ap.rowid"
+            lats = [p[0] for p in filter.area]
+            lons = [p[1] for p in filter.area]
+            clauses.append("r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?")
+            params.extend((min(lats), max(lats), min(lons), max(lons)))
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        cursor = self._tuple_query(sql, params)
+        aps: list[StaticAP] = []
+        for (
+            mac, lat_mean, lon_mean, loc_error_m, first_seen, last_seen, n_obs,
+            ssid, encryption, oui_manuf, is_randomized, type_,
+        ) in cursor:
+            if filter.area and not point_in_polygon(lat_mean, lon_mean, filter.area):
+                continue
+            # columns are typed by the schema, so skip per-row validation;
+            # only the 0/1 randomized flag needs converting
+            aps.append(StaticAP.model_construct(
+                mac=mac,
+                lat_mean=lat_mean,
+                lon_mean=lon_mean,
+                loc_error_m=loc_error_m,
+                first_seen=first_seen,
+                last_seen=last_seen,
+                n_obs=n_obs,
+                ssid=ssid,
+                encryption=encryption,
+                oui_manuf=oui_manuf,
+                is_randomized=None if is_randomized is None else bool(is_randomized),
+                type=type_,
+            ))
+        return aps
 
-    def get_mobile_tracks(self, filter: UIFilter) -> list[MobileTrack]:
+    def get_mobile_track_dicts(self, filter: UIFilter) -> list[MobileTrackDict]:
         """
-        Return one Track per MAC, with metadata (ssid, etc), total packet count,
-        and a list of all decimated points.
+        Return one track dict per MAC, with metadata (ssid, etc), total packet
+        count, and a list of all decimated points, shaped like MobileTrack.
         """
+        # points are aggregated per mac in sqlite; json_object renders REAL
+        # values with 15 significant digits, so coordinates are passed as
+        # 17-digit text that parses back to the exact stored doubles
         sql = """
-            WITH obs_counts AS (
-              SELECT mac, COUNT(*) AS n_obs
-              FROM observations
-              GROUP BY mac
-            )
             SELECT
               mt.mac,
-              mt.ts,
-              mt.lat,
-              mt.lon,
               d.ssid,
               d.encryption,
               d.oui_manuf,
               d.is_randomized,
               d.type        AS device_type,
-              oc.n_obs
+              oc.n_obs,
+              json_group_array(json_object(
+                'ts', mt.ts,
+                'lat', json(printf('%!.17g', mt.lat)),
+                'lon', json(printf('%!.17g', mt.lon))
+              )) AS points
             FROM mobile_track mt
             LEFT JOIN devices d  ON mt.mac = d.mac
-            LEFT JOIN obs_counts oc ON mt.mac = oc.mac
+            LEFT JOIN device_obs_count oc ON mt.mac = oc.mac
             """
-        params: list[int] = []
-        clauses: list[str] = []
+        clauses, params = self._device_filter(filter, "mt.mac", "d")
         if filter.time_range:
             clauses.append("mt.ts BETWEEN ? AND ?")
             params.extend(filter.time_range)
         if filter.packet_count:
             clauses.append("oc.n_obs BETWEEN ? AND ?")
             params.extend(filter.packet_count)
+        clauses.extend(self._area_bbox(filter, "mt.lat", "mt.lon", params))
         if clauses:
             sql += " WHERE " + " AND ".join(clauses)
-        sql += " ORDER BY mt.mac, mt.ts"
-        cursor = self.conn.execute(sql, tuple(params))
-        rows = cursor.fetchall()
-        tracks: dict[str, dict] = {}
-        for row in rows:
-            m = row["mac"]
-            if m not in tracks:
-                tracks[m] = {
-                    "mac": m,
-                    "ssid": row["ssid"],
-                    "encryption": row["encryption"],
-                    "oui_manuf": row["oui_manuf"],
-                    "is_randomized": bool(row["is_randomized"]),
-                    "device_type": row["device_type"],
-                    "n_obs": row["n_obs"],
-                    "points": [],
-                }
-            tracks[m]["points"].append(
-                {
-                    "ts": row["ts"],
-                    "lat": row["lat"],
-                    "lon": row["lon"],
-                }
-            )
-            
-        # TODO: if filter.points_count, apply post filter to remove from tracks if num points not in range of points_count
-        return [MobileTrack(**t) for t in tracks.values()]
+        sql += " GROUP BY mt.mac ORDER BY mt.mac"
+        cursor = self._tuple_query(sql, params)
+        lo, hi = filter.points_count or (0, math.inf)
+        tracks: list[MobileTrackDict] = []
+        for mac, ssid, encryption, oui_manuf, is_randomized, device_type, n_obs, blob in cursor:
+            points: list[TrackPointDict] = orjson.loads(blob)
+            # json_group_array has no defined element order, so restore
+            # timestamp order whatever plan sqlite picked
+            points.sort(key=itemgetter("ts"))
+            if filter.area:
+                points = [p for p in points if point_in_polygon(p["lat"], p["lon"], filter.area)]
+                if not points:
+                    continue
+            if not lo <= len(points) <= hi:
+                continue
+            tracks.append({
+                "mac": mac,
+                "ssid": ssid,
+                "encryption": encryption,
+                "oui_manuf": oui_manuf,
+                "is_randomized": bool(is_randomized),
+                "device_type": device_type,
+                "n_obs": n_obs,
+                "points": points,
+            })
+        return tracks
 
-    def get_encryption_counts(self, filter: UIFilter) -> list[tuple[str, int]]:
+    def get_mobile_tracks(self, filter: UIFilter) -> list[MobileTrack]:
         """
-        Return counts of observations grouped by encryption type,
-        filtered by time and static/mobile flags.
+        Return one Track per MAC, with metadata (ssid, etc), total packet count,
+        and a list of all decimated points.
         """
-        sql = """
-        SELECT d.encryption AS encryption, COUNT(*) AS cnt
-        FROM observations o
-        JOIN devices d ON o.mac = d.mac
+        # the dicts are already shaped and typed like MobileTrack
+        tracks = []
+        for t in self.get_mobile_track_dicts(filter):
+            track = MobileTrack.model_construct(**t)
+            track.points = [TrackPoint.model_construct(**p) for p in t["points"]]
+            tracks.append(track)
+        return tracks
+
+    def _device_filter(
+        self, filter: UIFilter, mac_col: str, devices: str
+    ) -> tuple[list[str], list[object]]:
         """
-        params: list[int] = []
+        Build WHERE clauses (and their params) for the UI's device attribute
+        filters: mac, ssid, encryption protocol, oui and randomized.
+
+        Parameters
+        ----------
+        filter
+            UI filter.
+        mac_col
+            Column holding the MAC of the rows being filtered.
+        devices
+            Name or alias of the joined devices table.
+        """
+        clauses: list[str] = []
+        params: list[object] = []
+        for values, col in (
+            (filter.mac, mac_col),
+            (filter.ssid, f"{devices}.ssid"),
+            (filter.encryption, _encryption_protocol_sql(f"{devices}.encryption")),
+            (filter.oui, f"{devices}.oui_manuf"),
+        ):
+            if values:
+                clauses.append(f"{col} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if filter.randomized is not None:
+            clauses.append(f"{devices}.is_randomized = ?")
+            params.append(int(filter.randomized))
+        return clauses, params
+
+    def _area_bbox(self, filter: UIFilter, lat_col: str, lon_col: str, params: list[object]) -> list[str]:
+        """
+        Return the WHERE clause bounding `filter.area` by its bounding box,
+        appending its params; callers still test the polygon itself.
+        """
+        if not filter.area:
+            return []
+        lats = [p[0] for p in filter.area]
+        lons = [p[1] for p in filter.area]
+        params.extend((min(lats), max(lats), min(lons), max(lons)))
+        return [f"{lat_col} BETWEEN ? AND ? AND {lon_col} BETWEEN ? AND ?"]
+
+    def _observation_filter(self, filter: UIFilter) -> tuple[str, list[object]]:
+        """
+        Build the WHERE clause (and its params) applying the UI time and
+        static/mobile filters to observations aliased as `o`.
+        """
+        params: list[object] = []
         clauses: list[str] = []
         if filter.time_range:
             clauses.append("o.ts BETWEEN ? AND ?")
@@ -512,28 +941,77 @@ class DAO:
             clauses.append("o.mac NOT IN (SELECT mac FROM static_ap)")
         if filter.exclude_mobile:
             clauses.append("o.mac NOT IN (SELECT mac FROM mobile_track)")
-        if clauses:
-            sql += " WHERE " + " AND ".join(clauses)
-        sql += " GROUP BY d.encryption"
-        cursor = self.conn.execute(sql, tuple(params))
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        return where, params
 
-        # normalize to protocol only and re‐aggregate
-        raw_counts = [(row["encryption"], row["cnt"]) for row in cursor.fetchall()]
-        protocol_counts: dict[str, int] = {}
-        for enc, cnt in raw_counts:
-            proto = enc.split(" ")[0]
-            if proto == "WPA1":
-                proto = "WPA"
-            # only keep our five protocols plus empty string
-            if proto not in ["", "Open", "WEP", "WPA", "WPA2", "WPA3"]:
+    def get_atmos(self, filter: UIFilter) -> AtmosSummary:
+        """
+        Return all atmospherics summaries from a single pass over observations.
+
+        Equivalent to combining get_encryption_counts, get_oui_counts,
+        get_unique_mac_count, get_unique_ssid_count and get_mac_counts.
+        """
+        if filter.time_range:
+            source, cnt, group = "observations o", "COUNT(*)", " GROUP BY o.mac"
+        else:
+            # without a time window the per-mac totals are already maintained
+            # at ingest, so read them instead of aggregating observations
+            source, cnt, group = "device_obs_count o", "o.n_obs", ""
+        sql = f"""
+        SELECT o.mac AS mac,
+          d.mac IS NOT NULL AS known,
+          d.ssid AS ssid,
+          {_encryption_protocol_sql("d.encryption")} AS proto,
+          d.oui_manuf AS oui,
+          {cnt} AS cnt
+        FROM {source}
+        LEFT JOIN devices d ON o.mac = d.mac
+        """
+        where, params = self._observation_filter(filter)
+        sql += where + group
+
+        # pivot the per-mac counts into every summary the dashboard shows
+        mac_counts: list[tuple[str, str | None, int]] = []
+        enc_counts: dict[str, int] = {}
+        oui_counts: dict[str | None, int] = {}
+        ssids: set[str] = set()
+        for mac, known, ssid, proto, oui, cnt in self._tuple_query(sql, params):
+            mac_counts.append((mac, ssid, cnt))
+            if not known:
                 continue
-            protocol_counts[proto] = protocol_counts.get(proto, 0) + cnt
-        # return protocols sorted by count in descending order
-        return sorted(
-            protocol_counts.items(),
-            key=lambda pair: pair[1],
-            reverse=True,
-        )
+            if proto in _ENCRYPTION_PROTOCOLS:
+                enc_counts[proto] = enc_counts.get(proto, 0) + cnt
+            oui_counts[oui] = oui_counts.get(oui, 0) + cnt
+            if ssid is not None:
+                ssids.add(ssid)
+
+        by_count = lambda pair: pair[-1]
+        return {
+            "encryption_counts": sorted(enc_counts.items(), key=by_count, reverse=True),
+            "oui_counts": sorted(oui_counts.items(), key=by_count, reverse=True)[:5],
+            "unique_mac_count": len(mac_counts),
+            "unique_ssid_count": len(ssids),
+            "mac_counts": sorted(mac_counts, key=by_count, reverse=True),
+        }
+
+    def get_encryption_counts(self, filter: UIFilter) -> list[tuple[str, int]]:
+        """
+        Return counts of observations grouped by encryption type,
+        filtered by time and static/mobile flags.
+        """
+        # normalized and bucketed by sqlite, so only one row per protocol comes back
+        proto = _encryption_protocol_sql("d.encryption")
+        sql = f"""
+        SELECT {proto} AS proto, COUNT(*) AS cnt
+        FROM observations o
+        JOIN devices d ON o.mac = d.mac
+        """
+        where, params = self._observation_filter(filter)
+        reported = f"{proto} IN ({', '.join('?' * len(_ENCRYPTION_PROTOCOLS))})"
+        sql += (where + " AND " if where else " WHERE ") + reported
+        params.extend(_ENCRYPTION_PROTOCOLS)
+        sql += " GROUP BY proto ORDER BY cnt DESC"
+        return self._tuple_query(sql, params).fetchall()
 
     def get_mac_counts(self, filter: UIFilter) -> list[tuple[str, str, int]]:
         """
@@ -548,20 +1026,10 @@ class DAO:
         FROM observations o
         LEFT JOIN devices d ON o.mac = d.mac
         """
-        params: list[int] = []
-        clauses: list[str] = []
-        if filter.time_range:
-            clauses.append("o.ts BETWEEN ? AND ?")
-            params.extend(filter.time_range)
-        if filter.exclude_static:
-            clauses.append("o.mac NOT IN (SELECT mac FROM static_ap)")
-        if filter.exclude_mobile:
-            clauses.append("o.mac NOT IN (SELECT mac FROM mobile_track)")
-        if clauses:
-            sql += " WHERE " + " AND ".join(clauses)
+        where, params = self._observation_filter(filter)
+        sql += where
         sql += " GROUP BY o.mac ORDER BY cnt DESC"
-        cursor = self.conn.execute(sql, tuple(params))
-        return [(row["mac"], row["ssid"], row["cnt"]) for row in cursor.fetchall()]
+        return self._tuple_query(sql, params).fetchall()
 
     def get_unique_mac_count(self, filter: UIFilter) -> int:
         """
@@ -569,17 +1037,8 @@ class DAO:
         filtered by time and static/mobile flags.
         """
         sql = "SELECT COUNT(DISTINCT o.mac) FROM observations o"
-        params: list[int] = []
-        clauses: list[str] = []
-        if filter.time_range:
-            clauses.append("o.ts BETWEEN ? AND ?")
-            params.extend(filter.time_range)
-        if filter.exclude_static:
-            clauses.append("o.mac NOT IN (SELECT mac FROM static_ap)")
-        if filter.exclude_mobile:
-            clauses.append("o.mac NOT IN (SELECT mac FROM mobile_track)")
-        if clauses:
-            sql += " WHERE " + " AND ".join(clauses)
+        where, params = self._observation_filter(filter)
+        sql += where
         cursor = self.conn.execute(sql, tuple(params))
         return cursor.fetchone()[0]
 
@@ -593,17 +1052,8 @@ class DAO:
         FROM observations o
         JOIN devices d ON o.mac = d.mac
         """
-        params: list[int] = []
-        clauses: list[str] = []
-        if filter.time_range:
-            clauses.append("o.ts BETWEEN ? AND ?")
-            params.extend(filter.time_range)
-        if filter.exclude_static:
-            clauses.append("o.mac NOT IN (SELECT mac FROM static_ap)")
-        if filter.exclude_mobile:
-            clauses.append("o.mac NOT IN (SELECT mac FROM mobile_track)")
-        if clauses:
-            sql += " WHERE " + " AND ".join(clauses)
+        where, params = self._observation_filter(filter)
+        sql += where
         cursor = self.conn.execute(sql, tuple(params))
         return cursor.fetchone()[0]
 
@@ -617,17 +1067,31 @@ class DAO:
         FROM observations o
         JOIN devices d ON o.mac = d.mac
         """
-        params: list[int] = []
-        clauses: list[str] = []
-        if filter.time_range:
-            clauses.append("o.ts BETWEEN ? AND ?")
-            params.extend(filter.time_range)
-        if filter.exclude_static:
-            clauses.append("o.mac NOT IN (SELECT mac FROM static_ap)")
-        if filter.exclude_mobile:
-            clauses.append("o.mac NOT IN (SELECT mac FROM mobile_track)")
-        if clauses:
-            sql += " WHERE " + " AND ".join(clauses)
+        where, params = self._observation_filter(filter)
+        sql += where
         sql += " GROUP BY d.oui_manuf ORDER BY cnt DESC LIMIT 5"
-        cursor = self.conn.execute(sql, tuple(params))
-        return [(row["oui"], row["cnt"]) for row in cursor.fetchall()]
+        return self._tuple_query(sql, params).fetchall()
+
+
+class DAOReaderPool:
+    """
+    Fixed set of read-only DAOs over one mission database.
+
+    Each call checks out its own connection, so concurrent API requests read
+    in parallel under WAL instead of queueing on a single connection.
+    """
+
+    def __init__(self, db_path: str, size: int):
+        self._idle: SimpleQueue[DAO] = SimpleQueue()
+        for _ in range(size):
+            self._idle.put(DAO(db_path, read_only=True))
+
+    def run(self, fn: Callable[[DAO], T]) -> T:
+        """
+        Call `fn` with an idle DAO, blocking until one is free.
+        """
+        dao = self._idle.get()
+        try:
+            return fn(dao)
+        finally:
+            self._idle.put(dao)
@@ -1,28 +1,113 @@
 import os
 import sqlite3
+from pathlib import Path
 from wf.utils.log import get_logger
 
 logger = get_logger(__name__)
 
-def get_connection(db_path: str) -> sqlite3.Connection:
+# tables maintained incrementally by the DAO, with the statement that
+# rebuilds each from its source for databases that predate it
+_BACKFILLS = {
+    "device_obs_count": (
+        "INSERT INTO device_obs_count (mac, n_obs) "
+        "SELECT mac, COUNT(*) FROM observations GROUP BY mac"
+    ),
+    "obs_rtree": (
+        "INSERT INTO obs_rtree (id, min_lat, max_lat, min_lon, max_lon) "
+        "SELECT id, lat, lat, lon, lon FROM observations "
+        "WHERE lat IS NOT NULL AND lon IS NOT NULL"
+    ),
+    "static_ap_rtree": (
+        "INSERT INTO static_ap_rtree (id, min_lat, max_lat, min_lon, max_lon) "
+        "SELECT rowid, lat_mean, lat_mean, lon_mean, lon_mean FROM static_ap"
+    ),
+}
+
+def _backfill_key(table: str) -> str:
+    """
+    Meta key recording that `table` has been backfilled.
+    """
+    return f"backfilled_{table}"
+
+def _pending_backfills(conn: sqlite3.Connection) -> list[str]:
+    """
+    Return the tables in `_BACKFILLS` whose backfill has not committed yet.
     """
-    Get a SQLite connection with foreign-keys enabled
-    and rows returned as sqlite3.Row.
+    keys = [_backfill_key(table) for table in _BACKFILLS]
+    done = {
+        row["key"]
+        for row in conn.execute(
+            f"SELECT key FROM meta WHERE key IN ({', '.join('?' * len(keys))})", keys
+        )
+    }
+    return [table for table in _BACKFILLS if _backfill_key(table) not in done]
+
+def get_connection(
+    db_path: str, check_same_thread: bool = True, read_only: bool = False
+) -> sqlite3.Connection:
     """
-    conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+    Get a SQLite connection with foreign-keys enabled, WAL journaling,
+    a large page cache and memory-mapped I/O, and rows returned as
+    sqlite3.Row.
+
+    The connection is in autocommit mode: Python's sqlite3 module never opens
+    transactions implicitly, so writers must group statements with
+    `DAO.transaction()`.
+
+    A `read_only` connection is opened with `mode=ro`, so it never takes a
+    write lock; the database must already exist and be initialized by a
+    writer (`init_db`).
+    """
+    database = f"{Path(db_path).resolve().as_uri()}?mode=ro" if read_only else db_path
+    conn = sqlite3.connect(
+        database,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=check_same_thread,
+        cached_statements=256,
+        isolation_level=None,
+        uri=read_only,
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+    # wal lets readers run during ingest; with synchronous=normal a commit
+    # appends to the log instead of fsyncing the main database every time
+    # (the journal mode is persistent, so read-only connections inherit it)
+    if db_path != ":memory:" and not read_only:
+        conn.execute("PRAGMA journal_mode = WAL;")
+        # checkpoint every 1000 pages so the log stays small between ingests
+        conn.execute("PRAGMA wal_autocheckpoint = 1000;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute("PRAGMA cache_size = -65536;")    # 64 MiB page cache
+    conn.execute("PRAGMA mmap_size = 268435456;")  # 256 MiB memory map
     return conn
 
-def init_db(db_path: str) -> sqlite3.Connection:
+def init_db(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
     """
     Initialize (or migrate) the database by running the
     DDL in schema.sql, then return a live connection.
     """
-    conn = get_connection(db_path)
+    conn = get_connection(db_path, check_same_thread)
     schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
     logger.info("Initializing DB schema: %s", schema_path)
     with open(schema_path, "r") as f:
         conn.executescript(f.read())
-    conn.commit()
-    return conn
\ No newline at end of file
+    # derived tables added after databases were already in use get filled
+    # once; each refill commits together with its completion marker, so an
+    # interrupted backfill is simply redone on the next open
+    if _pending_backfills(conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # re-checked under the write lock in case another process got here first
+            for table in _pending_backfills(conn):
+                logger.info("Backfilling %s", table)
+                conn.execute(f"DELETE FROM {table}")
+                conn.execute(_BACKFILLS[table])
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES (?, 1)", (_backfill_key(table),)
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    return conn
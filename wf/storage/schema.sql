@@ -8,6 +8,26 @@ CREATE TABLE IF NOT EXISTS sessions (
     start_ts INTEGER NOT NULL,     -- UTC seconds
     end_ts INTEGER NOT NULL        -- UTC seconds
 );
+-- one session per raw file; also serves the ingest's already-seen lookup
+CREATE UNIQUE INDEX IF NOT EXISTS idx_sessions_sha256 ON sessions(sha256);
+
+-- Mission-wide key/value metadata; `data_version` is bumped on every write
+-- that changes what the API serves, and keys the server's HTTP caching
+-- (a missing row reads as 0, so opening a database never writes here);
+-- `max_mobile_points` is refreshed whenever mobile_track is rewritten;
+-- `backfilled_<table>` marks a derived table filled by init_db
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+-- SHA-256 of raw files keyed by (size, mtime) so re-ingest skips re-hashing
+CREATE TABLE IF NOT EXISTS file_hash_cache (
+    path TEXT PRIMARY KEY,         -- absolute filepath
+    size INTEGER NOT NULL,         -- bytes
+    mtime_ns INTEGER NOT NULL,     -- st_mtime_ns
+    sha256 TEXT NOT NULL           -- hex hash of raw file
+);
 
 CREATE TABLE IF NOT EXISTS devices (
     mac TEXT PRIMARY KEY,          -- device MAC/BSSID
@@ -32,6 +52,28 @@ CREATE TABLE IF NOT EXISTS observations (
     frequency INTEGER              -- in Hz
 );
 
+-- Covering index for the classifier's Pass 0 dedup; lets GROUP BY/ORDER BY
+-- walk the index in (mac, ts) order instead of building a temp b-tree
+CREATE INDEX IF NOT EXISTS idx_obs_dedup
+    ON observations(mac, ts, lat, lon, rssi)
+    WHERE lat IS NOT NULL AND lon IS NOT NULL;
+
+-- Running observation count per MAC, maintained by the DAO on insert so the
+-- API never has to aggregate the observations table to report n_obs
+CREATE TABLE IF NOT EXISTS device_obs_count (
+    mac TEXT PRIMARY KEY,
+    n_obs INTEGER NOT NULL
+);
+-- lets MAX(n_obs) (the UI's packet-count slider bound) read one index entry
+CREATE INDEX IF NOT EXISTS idx_obs_count_n ON device_obs_count(n_obs);
+
+-- Indexes for the API: per-MAC counts and anti-joins walk idx_obs_mac_ts,
+-- time-range filters walk idx_obs_ts_mac, and session bounds are read from
+-- idx_obs_session_ts, each without touching the table
+CREATE INDEX IF NOT EXISTS idx_obs_mac_ts ON observations(mac, ts);
+CREATE INDEX IF NOT EXISTS idx_obs_ts_mac ON observations(ts, mac);
+CREATE INDEX IF NOT EXISTS idx_obs_session_ts ON observations(session_id, ts);
+
 -- CREATE TABLE IF NOT EXISTS device_locations (
 --     mac TEXT NOT NULL REFERENCES devices(mac),
 --     ts INTEGER NOT NULL,
@@ -39,12 +81,13 @@ CREATE TABLE IF NOT EXISTS observations (
 --     lon REAL
 -- );
 
--- -- Spatial index on observations (or device_locations) for fast bbox queries
--- CREATE VIRTUAL TABLE IF NOT EXISTS obs_rtree USING rtree(
---     id,
---     min_lat, min_lon,
---     max_lat, max_lon
--- );
+-- Spatial index over located observations (id = observations.id);
+-- populated by the DAO with one insert-select per bulk load
+CREATE VIRTUAL TABLE IF NOT EXISTS obs_rtree USING rtree(
+    id,
+    min_lat, max_lat,
+    min_lon, max_lon
+);
 
 -- -- Full-text lookup for manufacturer & SSID
 -- CREATE VIRTUAL TABLE IF NOT EXISTS device_fts USING fts5(
@@ -71,6 +114,14 @@ CREATE TABLE IF NOT EXISTS static_ap (
     n_obs       INTEGER NOT NULL
 );
 
+-- Spatial index over static AP positions (id = static_ap.rowid); maintained
+-- by the DAO alongside static_ap for area-filtered queries
+CREATE VIRTUAL TABLE IF NOT EXISTS static_ap_rtree USING rtree(
+    id,
+    min_lat, max_lat,
+    min_lon, max_lon
+);
+
 CREATE TABLE IF NOT EXISTS mobile_track (
     mac TEXT    NOT NULL,
     ts  INTEGER NOT NULL,
@@ -7,6 +7,14 @@ Geospatial utility functions.
 import math
 from typing import Tuple
 
+import numpy as np
+from numba import njit
+
+EARTH_RADIUS_M = 6371000.0  # mean Earth radius in metres
+
+# max pairwise-matrix cells materialized at once (~32 MB of float64)
+_PAIRWISE_BLOCK_CELLS = 4_000_000
+
 def haversine(a: Tuple[float, float], b: Tuple[float, float]) -> float:
     """
     Compute the great-circle distance between two points on the Earth.
@@ -28,35 +36,292 @@ def haversine(a: Tuple[float, float], b: Tuple[float, float]) -> float:
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
     d_phi = phi2 - phi1
     d_lam = math.radians(lon2 - lon1)
-    r = 6371000.0  # Earth radius in metres
     h = math.sin(d_phi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(d_lam/2)**2
-    return 2 * r * math.asin(math.sqrt(h))
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(h))
 
-def geometric_median(
-    points: list[tuple[float,float]],
-    weights: list[float],
-    eps: float = 1e-6
-) -> tuple[float,float]:
+def diameter_bounds(lat: np.ndarray, lon: np.ndarray) -> tuple[float, float]:
+    """
+    Bound the great-circle diameter of a point set from its bounding box in O(N).
+
+    Both bounds follow from the haversine formula itself: the latitude span (and
+    the longitude span at the highest absolute latitude) give a lower bound, and
+    the box diagonal at the lowest absolute latitude gives an upper bound.
+
+    Parameters
+    ----------
+    lat
+        Latitudes in decimal degrees.
+    lon
+        Longitudes in decimal degrees.
+
+    Returns
+    -------
+    tuple[float, float]
+        (lower, upper) bounds on the diameter in metres.
+    """
+    if len(lat) < 2:
+        return 0.0, 0.0
+    lat_lo, lat_hi = math.radians(float(np.min(lat))), math.radians(float(np.max(lat)))
+    d_phi = lat_hi - lat_lo
+    d_lam = math.radians(float(np.max(lon)) - float(np.min(lon)))
+    if lat_lo <= 0.0 <= lat_hi:
+        cos_hi = 1.0
+    else:
+        cos_hi = math.cos(min(abs(lat_lo), abs(lat_hi)))
+    cos_lo = math.cos(max(abs(lat_lo), abs(lat_hi)))
+
+    lower = EARTH_RADIUS_M * d_phi
+    if d_lam >= math.pi:
+        # box straddles the antimeridian; only the latitude span is informative
+        return lower, math.pi * EARTH_RADIUS_M
+    s_lam = math.sin(d_lam/2)
+    lower = max(lower, 2 * EARTH_RADIUS_M * math.asin(cos_lo * s_lam))
+    h_hi = math.sin(d_phi/2)**2 + cos_hi**2 * s_lam**2
+    upper = 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(h_hi, 1.0)))
+    return lower, upper
+
+def max_pairwise_distance(lat: np.ndarray, lon: np.ndarray) -> float:
+    """
+    Compute the largest great-circle distance between any two points.
+
+    The pairwise haversine terms are evaluated with NumPy broadcasting, in row
+    blocks so that long windows do not materialize a full N x N matrix.
+
+    Parameters
+    ----------
+    lat
+        Latitudes in decimal degrees.
+    lon
+        Longitudes in decimal degrees.
+
+    Returns
+    -------
+    float
+        Diameter of the point set in metres (0.0 for fewer than two points).
     """
-    Compute the geometric median of a list of points (Weiszfeld's algorithm).
+    n = len(lat)
+    if n < 2:
+        return 0.0
+    phi = np.radians(np.asarray(lat, dtype=np.float64))
+    lam = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_phi = np.cos(phi)
+    block = max(1, _PAIRWISE_BLOCK_CELLS // n)
+    h_max = 0.0
+    for i in range(0, n, block):
+        d_phi = phi[i:i+block, None] - phi[None, :]
+        d_lam = lam[i:i+block, None] - lam[None, :]
+        h = np.sin(d_phi/2)**2 + cos_phi[i:i+block, None]*cos_phi[None, :]*np.sin(d_lam/2)**2
+        # haversine is monotonic in h, so only the largest term needs the arcsin
+        h_max = max(h_max, float(h.max()))
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(h_max, 1.0)))
+
+def point_in_polygon(lat: float, lon: float, polygon: list[Tuple[float, float]]) -> bool:
+    """
+    Test whether a point lies inside a polygon (even-odd ray casting).
+
+    Parameters
+    ----------
+    lat, lon
+        Point in decimal degrees.
+    polygon
+        Vertices as (latitude, longitude) pairs; the ring is closed implicitly.
+
+    Returns
+    -------
+    bool
+        True if the point is inside the polygon.
     """
-    total_w = sum(weights)
+    inside = False
+    n = len(polygon)
+    j = n - 1
+    for i in range(n):
+        lat_i, lon_i = polygon[i]
+        lat_j, lon_j = polygon[j]
+        # count edges crossed by a ray running east from the point
+        if (lat_i > lat) != (lat_j > lat):
+            cross_lon = lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i)
+            if lon < cross_lon:
+                inside = not inside
+        j = i
+    return inside
+
+@njit(cache=True)
+def haversine_rad(phi1: float, lam1: float, phi2: float, lam2: float) -> float:
+    """
+    Great-circle distance between two points given in radians.
+
+    Numba-compiled scalar counterpart of `haversine`, callable from other
+    compiled kernels.
+
+    Returns
+    -------
+    float
+        Distance in metres.
+    """
+    h = math.sin((phi2 - phi1)/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin((lam2 - lam1)/2)**2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(h, 1.0)))
+
+# distances below this many metres count as coinciding with a data point
+_ANCHOR_TOL_M = 1e-9
+
+@njit(cache=True, fastmath=True)
+def _weiszfeld_step(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    phi: np.ndarray,
+    lam: np.ndarray,
+    cos_phi: np.ndarray,
+    weights: np.ndarray,
+    y_lat: float,
+    y_lon: float,
+) -> tuple[float, float, float, float]:
+    """
+    One Weiszfeld update from (y_lat, y_lon), skipping points that coincide with it.
+
+    `phi`, `lam` and `cos_phi` are the points' coordinates in radians and
+    the cosine of their latitude, computed once per median rather than on
+    every iteration.
+
+    Returns the update T~(y) in degrees, the norm of the residual pull
+    R~(y) in weight units, and the total weight eta of points at y
+    (Vardi & Zhang's notation).
+    """
+    y_phi = math.radians(y_lat)
+    y_lam = math.radians(y_lon)
+    cos_y = math.cos(y_phi)
+    m_per_rad_lon = EARTH_RADIUS_M * cos_y
+    num_lat = 0.0
+    num_lon = 0.0
+    denom = 0.0
+    r_y = 0.0
+    r_x = 0.0
+    eta = 0.0
+    for i in range(lat.shape[0]):
+        # haversine_rad with both cosines already known
+        h = (
+            math.sin((phi[i] - y_phi) / 2) ** 2
+            + cos_y * cos_phi[i] * math.sin((lam[i] - y_lam) / 2) ** 2
+        )
+        d = 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(h, 1.0)))
+        if d <= _ANCHOR_TOL_M:
+            eta += weights[i]
+            continue
+        inv = weights[i] / d
+        num_lat += inv * lat[i]
+        num_lon += inv * lon[i]
+        denom += inv
+        # pull towards point i, as a local east/north vector in metres
+        r_y += inv * (phi[i] - y_phi) * EARTH_RADIUS_M
+        r_x += inv * (lam[i] - y_lam) * m_per_rad_lon
+    if denom == 0.0:
+        return y_lat, y_lon, 0.0, eta
+    return num_lat / denom, num_lon / denom, math.sqrt(r_y * r_y + r_x * r_x), eta
+
+@njit(cache=True, fastmath=True)
+def _weiszfeld(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    weights: np.ndarray,
+    eps: float,
+    max_iter: int,
+) -> tuple[float, float]:
+    """
+    Compiled Weiszfeld iteration over degree coordinates; see `geometric_median`.
+    """
+    n = lat.shape[0]
+    total_w = 0.0
+    x_lat = 0.0
+    x_lon = 0.0
+    heaviest = 0
     # start at the weighted centroid
-    x_lat = sum(w * lat for (lat, _), w in zip(points, weights)) / total_w
-    x_lon = sum(w * lon for (_, lon), w in zip(points, weights)) / total_w
-
-    while True:
-        num_lat = num_lon = denom = 0.0
-        for (lat, lon), w in zip(points, weights):
-            # distance to current estimate
-            d = max(haversine((x_lat, x_lon), (lat, lon)), 1e-12)
-            inv = w / d
-            num_lat += inv * lat
-            num_lon += inv * lon
-            denom  += inv
-
-        new_lat = num_lat / denom
-        new_lon = num_lon / denom
-        if haversine((x_lat, x_lon), (new_lat, new_lon)) < eps:
-            return new_lat, new_lon
-        x_lat, x_lon = new_lat, new_lon
\ No newline at end of file
+    for i in range(n):
+        total_w += weights[i]
+        x_lat += weights[i] * lat[i]
+        x_lon += weights[i] * lon[i]
+        if weights[i] > weights[heaviest]:
+            heaviest = i
+    x_lat /= total_w
+    x_lon /= total_w
+    phi = np.radians(lat)
+    lam = np.radians(lon)
+    cos_phi = np.cos(phi)
+
+    # a dominant point is often the median itself, which plain Weiszfeld only
+    # approaches sublinearly; it is optimal iff its pull does not exceed its weight
+    _, _, r, eta = _weiszfeld_step(lat, lon, phi, lam, cos_phi, weights, lat[heaviest], lon[heaviest])
+    if r <= eta:
+        return lat[heaviest], lon[heaviest]
+
+    for _ in range(max_iter):
+        t_lat, t_lon, r, eta = _weiszfeld_step(lat, lon, phi, lam, cos_phi, weights, x_lat, x_lon)
+        if eta > 0.0:
+            # sitting on a data point: stop if it is optimal, otherwise leave it
+            # along the Vardi-Zhang blend of T~ and the current estimate
+            if r <= eta:
+                break
+            beta = eta / r
+            t_lat = (1.0 - beta) * t_lat + beta * x_lat
+            t_lon = (1.0 - beta) * t_lon + beta * x_lon
+        step = haversine_rad(
+            math.radians(x_lat), math.radians(x_lon),
+            math.radians(t_lat), math.radians(t_lon),
+        )
+        x_lat, x_lon = t_lat, t_lon
+        if step < eps:
+            break
+
+    # the tolerance can stop short of an optimal data point that the iterates
+    # were creeping towards; snap to the nearest one if it passes the same test
+    x_phi = math.radians(x_lat)
+    x_lam = math.radians(x_lon)
+    nearest = 0
+    d_min = math.inf
+    for i in range(n):
+        d = haversine_rad(x_phi, x_lam, phi[i], lam[i])
+        if d < d_min:
+            d_min = d
+            nearest = i
+    _, _, r, eta = _weiszfeld_step(lat, lon, phi, lam, cos_phi, weights, lat[nearest], lon[nearest])
+    if r <= eta:
+        return lat[nearest], lon[nearest]
+    return x_lat, x_lon
+
+def geometric_median(
+    points: np.ndarray,
+    weights: np.ndarray,
+    eps: float = 0.05,
+    max_iter: int = 1000,
+) -> tuple[float, float]:
+    """
+    Compute the weighted geometric median of a set of points (Weiszfeld's algorithm).
+
+    The iteration is compiled with Numba and measures distances with the
+    haversine formula. It starts from the weighted centroid, returns the
+    heaviest point directly when that point is the median, uses the
+    Vardi-Zhang modification whenever an iterate lands on a data point, and
+    finally snaps to the nearest data point if that point is optimal.
+
+    Parameters
+    ----------
+    points
+        (N, 2) array of (latitude, longitude) in decimal degrees.
+    weights
+        Non-negative weight per point.
+    eps
+        Stop once an iteration moves the estimate less than this many metres.
+    max_iter
+        Upper bound on the number of iterations.
+
+    Returns
+    -------
+    tuple[float, float]
+        (latitude, longitude) of the median in decimal degrees.
+    """
+    pts = np.asarray(points, dtype=np.float64)
+    return _weiszfeld(
+        np.ascontiguousarray(pts[:, 0]),
+        np.ascontiguousarray(pts[:, 1]),
+        np.ascontiguousarray(weights, dtype=np.float64),
+        eps,
+        max_iter,
+    )
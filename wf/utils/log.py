@@ -28,14 +28,45 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_record)
 
 
+# decided once per process: `wf ingest` also logs JSON to {cwd}/ingest.log
+_LOG_TO_FILE = len(sys.argv) > 1 and sys.argv[1] == "ingest"
+
+# console/file handlers shared by every wf logger, built on first use
+_handlers: list[logging.Handler] = []
+
+# loggers already configured, by name
+_loggers: dict[str, logging.Logger] = {}
+
+
+def _shared_handlers() -> list[logging.Handler]:
+    """
+    Build (once) the handlers every wf logger writes through, so the log
+    file is opened a single time however many modules log to it.
+    """
+    if not _handlers:
+        # Console via Rich
+        _handlers.append(RichHandler(rich_tracebacks=True))
+
+        # File output for `wf ingest`, as structured JSON
+        if _LOG_TO_FILE:
+            log_path = Path.cwd() / f"{sys.argv[1]}.log"
+            file_handler = logging.FileHandler(log_path, mode="a", encoding="utf-8")
+            file_handler.setFormatter(JSONFormatter())
+            _handlers.append(file_handler)
+    return _handlers
+
+
 def get_logger(name: str, level: int | str = logging.INFO) -> logging.Logger:
     """
     Return a configured logger for the given name.
 
-    Attaches:
+    Attaches the shared handlers:
     - a RichHandler for console output
     - when the command is 'ingest', a FileHandler writing JSON logs to {cwd}/ingest.log
 
+    Loggers are configured once per name; later calls return the cached
+    logger unchanged.
+
     Parameters
     ----------
     name
@@ -48,21 +79,15 @@ def get_logger(name: str, level: int | str = logging.INFO) -> logging.Logger:
     logging.Logger
         Configured logger instance.
     """
+    logger = _loggers.get(name)
+    if logger is not None:
+        return logger
+
     logger = logging.getLogger(name)
     logger.setLevel(level)
-
     if not logger.handlers:
-        # Console via Rich
-        console_handler = RichHandler(rich_tracebacks=True)
-        console_handler.setLevel(level)
-        logger.addHandler(console_handler)
-
-        # File output for `wf ingest`, as structured JSON
-        if len(sys.argv) > 1 and sys.argv[1] == "ingest":
-            log_path = Path.cwd() / f"{sys.argv[1]}.log"
-            file_handler = logging.FileHandler(log_path, mode="a", encoding="utf-8")
-            file_handler.setLevel(level)
-            file_handler.setFormatter(JSONFormatter())
-            logger.addHandler(file_handler)
+        for handler in _shared_handlers():
+            logger.addHandler(handler)
 
-    return logger
\ No newline at end of file
+    _loggers[name] = logger
+    return logger
@@ -0,0 +1,27 @@
+# wf/utils/mac.py
+
+"""
+MAC address encoding helpers.
+"""
+
+
+def mac_to_int(mac: str) -> int:
+    """
+    Encode a colon-separated MAC address as a 48-bit integer.
+
+    Parameters
+    ----------
+    mac
+        MAC address string, e.g. "AA:BB:CC:DD:EE:FF".
+
+    Returns
+    -------
+    int
+        The six octets packed big-endian into an integer.
+
+    Raises
+    ------
+    ValueError
+        If the string is not a hexadecimal MAC address.
+    """
+    return int(mac.replace(":", ""), 16)
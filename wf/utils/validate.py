@@ -6,6 +6,17 @@ from typing import Optional
 from pydantic import BaseModel
 
 
+# table-ordered rows produced by the models' to_tuple() and bound by the DAO
+DeviceRow = tuple[
+    str, Optional[str], Optional[int], Optional[int],
+    Optional[str], Optional[str], bool, Optional[str],
+]
+ObservationRow = tuple[
+    Optional[str], Optional[str], int, Optional[float], Optional[float],
+    Optional[int], Optional[int], Optional[int],
+]
+DrivePathRow = tuple[int, float, float]
+
 class Session(BaseModel):
     """
     Normalized record for a single session.
@@ -30,6 +41,15 @@ class Device(BaseModel):
     is_randomized: bool
     ssid: Optional[str]
 
+    def to_tuple(self) -> DeviceRow:
+        """
+        Return the fields in devices-table column order.
+        """
+        return (
+            self.mac, self.type, self.first_ts, self.last_ts,
+            self.oui_manuf, self.encryption, self.is_randomized, self.ssid,
+        )
+
 class Observation(BaseModel):
     """
     Normalized record for a single packet observation.
@@ -43,6 +63,15 @@ class Observation(BaseModel):
     channel: Optional[int]
     frequency: Optional[int]
 
+    def to_tuple(self) -> ObservationRow:
+        """
+        Return the fields in observations-table column order.
+        """
+        return (
+            self.mac, self.session_id, self.ts, self.lat, self.lon,
+            self.rssi, self.channel, self.frequency,
+        )
+
 class DrivePath(BaseModel):
     """
     Single GPS snapshot for vehicle path reconstruction.
@@ -50,6 +79,12 @@ class DrivePath(BaseModel):
     ts: int
     lat: float
     lon: float
+
+    def to_tuple(self) -> DrivePathRow:
+        """
+        Return the fields in drive_path-table column order.
+        """
+        return (self.ts, self.lat, self.lon)
     
 class StaticAP(BaseModel):
     """
@@ -197,27 +197,17 @@ document.addEventListener("DOMContentLoaded", () => {
 
   // get ranges for sliders before other data calls that use them in filters
   const sliderPromises = [
-    fetch("/api/max-packets")
+    fetch("/api/filter-ranges")
       .then(r => r.json())
-      .then(({ max_packets }) => {
+      .then(({ max_packets, max_points, min_ts, max_ts }) => {
         packetSlider.updateOptions({
           start: [0, max_packets],
           range: { min: 0, max: max_packets },
         });
-      })
-      .catch(console.error),
-    fetch("/api/max-points")
-      .then(r => r.json())
-      .then(({ max_points }) => {
         pointsSlider.updateOptions({
           start: [0, max_points],
           range: { min: 0, max: max_points },
         });
-      })
-      .catch(console.error),
-    fetch("/api/time-range")
-      .then(r => r.json())
-      .then(({ min_ts, max_ts }) => {
         timeSlider.updateOptions({
           start: [min_ts, max_ts],
           range: { min: min_ts, max: max_ts },
@@ -266,7 +256,8 @@ document.addEventListener("DOMContentLoaded", () => {
   })
     .then(r => r.json())
     .then(pathData => {
-      const coords = pathData.map(pt => [pt.lat, pt.lon]);
+      // columnar payload: { ts: [...], lat: [...], lon: [...] }
+      const coords = pathData.lat.map((lat, i) => [lat, pathData.lon[i]]);
       const poly = L.polyline(coords, { color: "red" }).addTo(map);
       if (coords.length) {
         L.marker(coords[0], { title: "Start" }).addTo(map).bindPopup("Start");